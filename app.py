@@ -1,11 +1,18 @@
+import os
+# TBB's worker pool hangs interpreter exit once a parallel Numba kernel has
+# been compiled off the main thread, as Streamlit does when it runs this
+# script. Must be set before Numba is imported; an explicit setting wins.
+os.environ.setdefault("NUMBA_THREADING_LAYER_PRIORITY", "omp workqueue tbb")
+
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import json
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+import itertools
+from typing import Tuple
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, safe_filename, load_json
 
 # Page configuration
 st.set_page_config(
@@ -36,12 +43,11 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def load_sample_loans():
-    """Load loan configurations from JSON file."""
+@st.cache_data(show_spinner=False)
+def load_sample_loans(path: str = "data/sample_loans.json"):
+    """Load loan configurations from JSON file (cached across reruns)."""
     try:
-        with open("data/sample_loans.json", 'r') as f:
-            data = json.load(f)
-        return data
+        return load_json(path)
     except FileNotFoundError:
         # Fallback data if file doesn't exist
         return {
@@ -54,17 +60,60 @@ def load_sample_loans():
             ]
         }
 
-def create_loan_comparison_chart(comparison_df):
+@st.cache_data(show_spinner=False)
+def build_comparison(loan_amount: float, loans_spec: Tuple[Tuple[str, float, int], ...]):
+    """Build loans and their comparison table (cached across reruns).
+
+    Args:
+        loan_amount: Principal shared by every loan option
+        loans_spec: Hashable (name, annual_rate, years) tuple per loan option
+    """
+    comparison = MortgageComparison()
+    loans = []
+    
+    for name, annual_rate, years in loans_spec:
+        loan = comparison.add_loan(
+            principal=loan_amount,
+            annual_rate=annual_rate,
+            years=years,
+            loan_name=name
+        )
+        loan.generate_amortization_table()
+        loans.append(loan)
+    
+    return loans, comparison.compare_loans()
+
+@st.cache_data(show_spinner=False)
+def build_amort_zip(loan_amount: float, loans_spec: Tuple[Tuple[str, float, int], ...]) -> bytes:
+    """Build a ZIP of every loan's amortization table as CSV (cached across reruns)."""
+    import zipfile
+    import io
+    
+    loans, _ = build_comparison(loan_amount, loans_spec)
+    
+    zip_buffer = io.BytesIO()
+    # Fastest DEFLATE level: CSV still compresses well and the UI isn't blocked
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        # Repeated loan names would otherwise write two members with one name
+        for loan, name in zip(loans, unique_loan_names(loans)):
+            safe_name = safe_filename(name)
+            csv_data = loan.amortization_table.to_csv(index=False)
+            zip_file.writestr(f"{safe_name}_amortization.csv", csv_data)
+    
+    return zip_buffer.getvalue()
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def create_loan_comparison_chart(loan_names: Tuple[str, ...], monthly_payments: Tuple[float, ...]):
     """Create a comparison chart for loan options."""
     fig = go.Figure()
     
     # Add monthly payment bars
     fig.add_trace(go.Bar(
         name='Monthly Payment',
-        x=comparison_df['loan_name'],
-        y=comparison_df['monthly_payment'],
+        x=loan_names,
+        y=monthly_payments,
         marker_color='#1f77b4',
-        text=[f'${x:,.0f}' for x in comparison_df['monthly_payment']],
+        texttemplate='$%{y:,.0f}',
         textposition='auto',
     ))
     
@@ -78,18 +127,19 @@ def create_loan_comparison_chart(comparison_df):
     
     return fig
 
-def create_total_cost_chart(comparison_df, down_payment):
+@st.cache_resource(max_entries=32, show_spinner=False)
+def create_total_cost_chart(loan_names: Tuple[str, ...], total_paid: Tuple[float, ...], down_payment: float):
     """Create total cost comparison chart."""
-    total_costs = down_payment + comparison_df['total_paid']
+    total_costs = [down_payment + paid for paid in total_paid]
     
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
         name='Total Cost',
-        x=comparison_df['loan_name'],
+        x=loan_names,
         y=total_costs,
         marker_color='#ff7f0e',
-        text=[f'${x:,.0f}' for x in total_costs],
+        texttemplate='$%{y:,.0f}',
         textposition='auto',
     ))
     
@@ -103,13 +153,28 @@ def create_total_cost_chart(comparison_df, down_payment):
     
     return fig
 
-def create_balance_over_time_chart(loans, home_price):
+def get_balance_series(loans):
+    """Get hashable (name, years, balances) year-end series for each loan, up to 30 years."""
+    series = []
+    for loan in loans:
+        year_ends_30yr = [(year, balance) for year, balance in loan.year_end_balance_dict.items() if year <= 30]
+        series.append((
+            loan.loan_name,
+            tuple(year for year, _ in year_ends_30yr),
+            tuple(balance for _, balance in year_ends_30yr)
+        ))
+    return tuple(series)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def create_balance_over_time_chart(balance_series: Tuple[Tuple[str, tuple, tuple], ...], home_price: float):
     """Create balance over time chart."""
+    # All traces use WebGL so the browser draws them in a single GL context
+    # instead of creating an SVG node per point
     fig = go.Figure()
     
     # Add home value line
     years = list(range(0, 31))
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=years,
         y=[home_price] * len(years),
         mode='lines',
@@ -119,16 +184,13 @@ def create_balance_over_time_chart(loans, home_price):
     ))
     
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-    for i, loan in enumerate(loans):
-        year_ends = loan.get_year_end_balances()
-        year_ends_30yr = year_ends[year_ends['Year'] <= 30]
-        
-        fig.add_trace(go.Scatter(
-            x=year_ends_30yr['Year'],
-            y=year_ends_30yr['Remaining_Balance'],
+    for (loan_name, years, balances), color in zip(balance_series, itertools.cycle(colors)):
+        fig.add_trace(go.Scattergl(
+            x=years,
+            y=balances,
             mode='lines+markers',
-            name=loan.loan_name,
-            line=dict(color=colors[i], width=2),
+            name=loan_name,
+            line=dict(color=color, width=2),
             marker=dict(size=4)
         ))
     
@@ -142,26 +204,23 @@ def create_balance_over_time_chart(loans, home_price):
     
     return fig
 
-def create_principal_interest_pie(loans):
-    """Create principal vs interest pie charts."""
+@st.cache_resource(max_entries=32, show_spinner=False)
+def create_principal_interest_pie(breakdowns: Tuple[Tuple[str, float, float], ...]):
+    """Create principal vs interest pie charts from (name, principal, interest) tuples."""
     fig = make_subplots(
-        rows=1, cols=len(loans),
-        specs=[[{'type': 'domain'} for _ in range(len(loans))]],
-        subplot_titles=[loan.loan_name for loan in loans]
+        rows=1, cols=len(breakdowns),
+        specs=[[{'type': 'domain'} for _ in range(len(breakdowns))]],
+        subplot_titles=[loan_name for loan_name, _, _ in breakdowns]
     )
     
     colors = ['#2ca02c', '#ff7f0e']
     
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
-        principal = loan.principal
-        interest = summary['total_interest']
-        
+    for i, (loan_name, principal, interest) in enumerate(breakdowns):
         fig.add_trace(go.Pie(
             labels=['Principal', 'Interest'],
             values=[principal, interest],
             marker_colors=colors,
-            name=loan.loan_name,
+            name=loan_name,
             textinfo='label+percent+value',
             texttemplate='%{label}<br>%{percent}<br>$%{value:,.0f}'
         ), row=1, col=i+1)
@@ -174,6 +233,47 @@ def create_principal_interest_pie(loans):
     
     return fig
 
+def unique_loan_names(loans):
+    """Loan names with the loan's position appended to any repeated name."""
+    names = []
+    for position, loan in enumerate(loans, 1):
+        name = loan.loan_name
+        while name in names:
+            name = f"{name} ({position})"
+        names.append(name)
+    return names
+
+def build_equity_table(loans, home_price, years=10):
+    """Build the formatted equity table: one row per year, one column per loan."""
+    # Year-end balances, one column per loan; years past a loan's term are
+    # paid off (zero balance). Names are made unique first, since users can
+    # give two loans the same name and duplicate columns can't be displayed.
+    balances = pd.concat(
+        [loan.year_end_balances.set_index('Year')['Remaining_Balance'].rename(name)
+         for loan, name in zip(loans, unique_loan_names(loans))],
+        axis=1
+    ).reindex(range(1, years + 1)).fillna(0)
+    equity = (home_price - balances).apply(lambda col: col.map('${:,.0f}'.format))
+    
+    equity_df = equity.rename_axis('Year').reset_index()
+    equity_df.insert(1, 'Home Value', f"${home_price:,}")
+    return equity_df
+
+def build_charts(loans, comparison_df, home_price, down_payment):
+    """Build the four dashboard figures for the current loans."""
+    loan_names = tuple(comparison_df['loan_name'])
+    breakdowns = tuple(
+        (loan.loan_name, loan.principal, loan.get_loan_summary()['total_interest'])
+        for loan in loans
+    )
+    
+    return (
+        create_loan_comparison_chart(loan_names, tuple(comparison_df['monthly_payment'])),
+        create_total_cost_chart(loan_names, tuple(comparison_df['total_paid']), down_payment),
+        create_balance_over_time_chart(get_balance_series(loans), home_price),
+        create_principal_interest_pie(breakdowns)
+    )
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🏠 Mortgage Calculator</h1>', unsafe_allow_html=True)
@@ -367,22 +467,28 @@ def main():
         # Use sample loans
         loans_to_use = sample_loans
     
-    # Create comparison
-    comparison = MortgageComparison()
-    loans = []
-    
-    for loan_data in loans_to_use:
-        loan = comparison.add_loan(
-            principal=loan_amount,
-            annual_rate=loan_data['annual_rate'],
-            years=loan_data['years'],
-            loan_name=loan_data['name']
-        )
-        loan.generate_amortization_table()
-        loans.append(loan)
+    # Create comparison (memoized on the loan inputs)
+    loans_spec = tuple(
+        (loan_data['name'], loan_data['annual_rate'], loan_data['years'])
+        for loan_data in loans_to_use
+    )
     
-    # Generate comparison data
-    comparison_df = comparison.compare_loans()
+    # Reuse this session's loans while the inputs are unchanged, skipping
+    # even the cache lookup (which deserializes a copy of every table)
+    if st.session_state.get('loans_spec') != (loan_amount, loans_spec):
+        st.session_state['loans'], st.session_state['comparison_df'] = build_comparison(loan_amount, loans_spec)
+        st.session_state['loans_spec'] = (loan_amount, loans_spec)
+    loans = st.session_state['loans']
+    comparison_df = st.session_state['comparison_df']
+    
+    # Only rebuild figures and downloads when the inputs actually change
+    inputs_hash = hash((loan_amount, loans_spec, home_price, down_payment))
+    if st.session_state.get('inputs_hash') != inputs_hash:
+        st.session_state['inputs_hash'] = inputs_hash
+        st.session_state['cached_figs'] = build_charts(loans, comparison_df, home_price, down_payment)
+        st.session_state['build_csv'] = False
+        st.session_state['comparison_csv'] = None
+    fig1, fig2, fig3, fig4 = st.session_state['cached_figs']
     
     # Main content
     # Show custom rates indicator
@@ -429,61 +535,38 @@ def main():
     col1, col2 = st.columns(2)
     
     with col1:
-        fig1 = create_loan_comparison_chart(comparison_df)
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        fig2 = create_total_cost_chart(comparison_df, down_payment)
         st.plotly_chart(fig2, use_container_width=True)
     
     # Balance over time
     st.header("📈 Balance Over Time")
-    fig3 = create_balance_over_time_chart(loans, home_price)
     st.plotly_chart(fig3, use_container_width=True)
     
     # Principal vs Interest breakdown
     st.header("🥧 Principal vs Interest Breakdown")
-    fig4 = create_principal_interest_pie(loans)
     st.plotly_chart(fig4, use_container_width=True)
     
     # Detailed comparison table
     st.header("📋 Detailed Comparison")
     
-    # Add total cost column
-    display_df = comparison_df.copy()
-    display_df['total_cost'] = down_payment + display_df['total_paid']
-    display_df['home_price'] = home_price
-    display_df['down_payment'] = down_payment
-    display_df['loan_amount'] = loan_amount
-    
-    # Format currency columns
-    for col in ['monthly_payment', 'total_interest', 'total_paid', 'total_cost', 'home_price', 'down_payment', 'loan_amount']:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].apply(lambda x: f"${x:,.2f}")
+    # Add total cost and purchase columns in a single allocation
+    display_df = comparison_df.assign(
+        total_cost=down_payment + comparison_df['total_paid'],
+        home_price=home_price,
+        down_payment=down_payment,
+        loan_amount=loan_amount
+    )
     
-    st.dataframe(display_df, use_container_width=True)
+    # Format currency columns for display only, keeping the data numeric
+    currency_cols = ['monthly_payment', 'total_interest', 'total_paid', 'total_cost', 'home_price', 'down_payment', 'loan_amount']
+    st.dataframe(display_df.style.format({col: "${:,.2f}" for col in currency_cols}), use_container_width=True)
     
     # Equity build-up analysis
     st.header("🏡 Equity Build-up Analysis")
     
-    equity_data = []
-    for year in range(1, 11):  # First 10 years
-        row = {'Year': year, 'Home Value': f"${home_price:,}"}
-        for loan in loans:
-            if year <= loan.years:
-                year_ends = loan.get_year_end_balances()
-                if year <= len(year_ends):
-                    balance = year_ends[year_ends['Year'] == year]['Remaining_Balance'].iloc[0]
-                    equity = home_price - balance
-                    row[loan.loan_name] = f"${equity:,.0f}"
-                else:
-                    row[loan.loan_name] = f"${home_price:,.0f}"
-            else:
-                row[loan.loan_name] = f"${home_price:,.0f}"
-        equity_data.append(row)
-    
-    equity_df = pd.DataFrame(equity_data)
-    st.dataframe(equity_df, use_container_width=True)
+    st.dataframe(build_equity_table(loans, home_price), use_container_width=True)
     
     # Download data
     st.header("💾 Download Data")
@@ -492,34 +575,25 @@ def main():
     
     with col1:
         if st.button("📥 Download Comparison Data"):
-            csv = display_df.to_csv(index=False)
+            st.session_state['build_csv'] = True
+        if st.session_state.get('build_csv'):
+            # Serialize once per set of inputs rather than on every rerun
+            if st.session_state.get('comparison_csv') is None:
+                st.session_state['comparison_csv'] = display_df.round({col: 2 for col in currency_cols}).to_csv(index=False)
             st.download_button(
                 label="Download CSV",
-                data=csv,
+                data=st.session_state['comparison_csv'],
                 file_name="mortgage_comparison.csv",
                 mime="text/csv"
             )
     
     with col2:
-        if st.button("📥 Download Amortization Tables"):
-            # Create a zip file with all amortization tables
-            import zipfile
-            import io
-            
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for loan in loans:
-                    safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
-                    csv_data = loan.amortization_table.to_csv(index=False)
-                    zip_file.writestr(f"{safe_name}_amortization.csv", csv_data)
-            
-            zip_buffer.seek(0)
-            st.download_button(
-                label="Download ZIP",
-                data=zip_buffer.getvalue(),
-                file_name="amortization_tables.zip",
-                mime="application/zip"
-            )
+        st.download_button(
+            label="📥 Download Amortization Tables",
+            data=build_amort_zip(loan_amount, loans_spec),
+            file_name="amortization_tables.zip",
+            mime="application/zip"
+        )
     
     # Footer
     st.markdown("---")
@@ -3,17 +3,15 @@
 Interactive Mortgage Calculator with Home Price and Down Payment Input
 """
 
-import json
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import (MortgageCalculator, MortgageComparison, format_comparison_table, load_json_cached,
+                                     safe_filename, save_amortization_tables)
+from src.plotting import SAVEFIG_KWARGS, shared_figure
 import matplotlib.pyplot as plt
-import pandas as pd
 import os
 
 def load_sample_loans(json_file="data/sample_loans.json"):
-    """Load loan data from JSON file."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    return data
+    """Load loan data from JSON file (cached until the file changes)."""
+    return load_json_cached(json_file)
 
 def get_user_input():
     """Get home price and down payment from user."""
@@ -96,18 +94,13 @@ def get_user_input():
     
     return home_price, down_payment, loan_amount
 
-def create_enhanced_visualizations(loans, comparison, home_price, down_payment):
-    """Create enhanced visualizations with home price context."""
-    # Create output directory
-    os.makedirs("output", exist_ok=True)
-    
-    # 1. Monthly Payment Comparison
-    plt.figure(figsize=(12, 8))
-    loan_names = [loan.loan_name for loan in loans]
-    monthly_payments = [loan.monthly_payment for loan in loans]
+def _plot_monthly(comparison_df, home_price, down_payment):
+    """Monthly payment comparison bar chart."""
+    monthly_payments = comparison_df['monthly_payment'].tolist()
     
+    shared_figure(12, 8)
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-    bars = plt.bar(loan_names, monthly_payments, color=colors)
+    bars = plt.bar(comparison_df['loan_name'].tolist(), monthly_payments, color=colors)
     plt.title(f'Monthly Payment Comparison\nHome: ${home_price:,.0f} | Down: ${down_payment:,.0f}', 
               fontsize=16, fontweight='bold')
     plt.xlabel('Loan Type', fontsize=12)
@@ -119,14 +112,15 @@ def create_enhanced_visualizations(loans, comparison, home_price, down_payment):
         plt.text(i, v + 20, f'${v:,.0f}', ha='center', va='bottom', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('output/monthly_payment_comparison.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 2. Total Cost Comparison (including down payment)
-    plt.figure(figsize=(12, 8))
-    total_costs = [down_payment + loan.get_loan_summary()['total_paid'] for loan in loans]
+    plt.savefig('output/monthly_payment_comparison.png', **SAVEFIG_KWARGS)
+
+def _plot_total_cost(comparison_df, home_price, down_payment):
+    """Total cost (including down payment) bar chart."""
+    total_costs = (down_payment + comparison_df['total_paid']).tolist()
     
-    bars = plt.bar(loan_names, total_costs, color=colors)
+    shared_figure(12, 8)
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
+    bars = plt.bar(comparison_df['loan_name'].tolist(), total_costs, color=colors)
     plt.title(f'Total Cost Comparison (Including Down Payment)\nHome: ${home_price:,.0f} | Down: ${down_payment:,.0f}', 
               fontsize=16, fontweight='bold')
     plt.xlabel('Loan Type', fontsize=12)
@@ -138,34 +132,32 @@ def create_enhanced_visualizations(loans, comparison, home_price, down_payment):
         plt.text(i, v + 5000, f'${v:,.0f}', ha='center', va='bottom', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('output/total_cost_comparison.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 3. Interest vs Principal Breakdown
-    fig, axes = plt.subplots(1, len(loans), figsize=(15, 6))
-    if len(loans) == 1:
+    plt.savefig('output/total_cost_comparison.png', **SAVEFIG_KWARGS)
+
+def _plot_pie(comparison_df):
+    """Principal vs interest pie chart per loan."""
+    loan_names = comparison_df['loan_name'].tolist()
+    axes = shared_figure(15, 6).subplots(1, len(loan_names))
+    if len(loan_names) == 1:
         axes = [axes]
     
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
-        principal = loan.principal
-        interest = summary['total_interest']
-        
+    for i, (name, principal, interest) in enumerate(zip(loan_names, comparison_df['principal'].tolist(),
+                                                        comparison_df['total_interest'].tolist())):
         # Create pie chart
         sizes = [principal, interest]
         labels = ['Principal', 'Interest']
         colors_pie = ['#2ca02c', '#ff7f0e']
         
         axes[i].pie(sizes, labels=labels, colors=colors_pie, autopct='%1.1f%%', startangle=90)
-        axes[i].set_title(f'{loan.loan_name}\nPrincipal: ${principal:,.0f}\nInterest: ${interest:,.0f}', 
+        axes[i].set_title(f'{name}\nPrincipal: ${principal:,.0f}\nInterest: ${interest:,.0f}', 
                          fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('output/principal_interest_breakdown.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 4. Balance Over Time with Home Value
-    plt.figure(figsize=(14, 8))
+    plt.savefig('output/principal_interest_breakdown.png', **SAVEFIG_KWARGS)
+
+def _plot_balance_vs_home(loans, home_price, down_payment):
+    """Remaining balance of each loan against the home value."""
+    shared_figure(14, 8)
     colors_line = ['#1f77b4', '#ff7f0e', '#2ca02c']
     
     # Add home value line
@@ -174,10 +166,10 @@ def create_enhanced_visualizations(loans, comparison, home_price, down_payment):
     plt.plot(years, home_values, 'k--', linewidth=2, label=f'Home Value (${home_price:,.0f})', alpha=0.7)
     
     for i, loan in enumerate(loans):
-        year_ends = loan.get_year_end_balances()
         # Show up to 30 years
-        year_ends_30yr = year_ends[year_ends['Year'] <= 30]
-        plt.plot(year_ends_30yr['Year'], year_ends_30yr['Remaining_Balance'], 
+        year_ends = loan.get_year_end_balances()
+        year_ends_30yr = year_ends.head(30)  # Years run 1, 2, ... so this is Year <= 30
+        plt.plot(year_ends_30yr['Year'].tolist(), year_ends_30yr['Remaining_Balance'].tolist(), 
                 marker='o', linewidth=2, label=loan.loan_name, color=colors_line[i])
     
     plt.title(f'Remaining Balance vs Home Value Over Time\nHome: ${home_price:,.0f} | Down: ${down_payment:,.0f}', 
@@ -187,8 +179,19 @@ def create_enhanced_visualizations(loans, comparison, home_price, down_payment):
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('output/balance_vs_home_value.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    plt.savefig('output/balance_vs_home_value.png', **SAVEFIG_KWARGS)
+
+def create_enhanced_visualizations(loans, comparison, home_price, down_payment):
+    """Create enhanced visualizations with home price context."""
+    # Create output directory
+    os.makedirs("output", exist_ok=True)
+    
+    comparison_df = comparison.compare_loans()
+    _plot_monthly(comparison_df, home_price, down_payment)
+    _plot_total_cost(comparison_df, home_price, down_payment)
+    _plot_pie(comparison_df)
+    _plot_balance_vs_home(loans, home_price, down_payment)
+    plt.close('all')
 
 def run_interactive_analysis():
     """Run interactive mortgage analysis."""
@@ -217,8 +220,7 @@ def run_interactive_analysis():
     
     # Generate amortization tables
     print("\nGenerating amortization tables...")
-    for loan in loans:
-        loan.generate_amortization_table()
+    comparison.generate_amortization_tables()
     
     # Display comparison
     print("\n" + "="*90)
@@ -226,29 +228,28 @@ def run_interactive_analysis():
     print("="*90)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Show enhanced insights
+    summaries = [loan.get_loan_summary() for loan in loans]
     print(f"\nKey Insights:")
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
+    for loan, summary in zip(loans, summaries):
         total_cost = down_payment + summary['total_paid']
         print(f"• {loan.loan_name}: ${summary['monthly_payment']:,.2f}/month, ${summary['total_interest']:,.2f} interest, ${total_cost:,.2f} total cost")
     
     # Find best options
-    monthly_payments = [loan.monthly_payment for loan in loans]
-    total_interests = [loan.get_loan_summary()['total_interest'] for loan in loans]
-    total_costs = [down_payment + loan.get_loan_summary()['total_paid'] for loan in loans]
-    
-    min_payment_idx = monthly_payments.index(min(monthly_payments))
-    min_interest_idx = total_interests.index(min(total_interests))
-    min_cost_idx = total_costs.index(min(total_costs))
+    loan_names = comparison_df['loan_name'].to_numpy()
+    # Third column becomes total cost: the down payment plus everything paid on the loan
+    metrics = comparison_df[['monthly_payment', 'total_interest', 'total_paid']].to_numpy() + [0, 0, down_payment]
+    monthly_payments, total_interests, total_costs = metrics.T
+    min_payment_idx, min_interest_idx, min_cost_idx = metrics.argmin(axis=0)
     
-    print(f"\n• Lowest monthly payment: {loans[min_payment_idx].loan_name} (${monthly_payments[min_payment_idx]:,.2f})")
-    print(f"• Lowest total interest: {loans[min_interest_idx].loan_name} (${total_interests[min_interest_idx]:,.2f})")
-    print(f"• Lowest total cost: {loans[min_cost_idx].loan_name} (${total_costs[min_cost_idx]:,.2f})")
+    print(f"\n• Lowest monthly payment: {loan_names[min_payment_idx]} (${monthly_payments[min_payment_idx]:,.2f})")
+    print(f"• Lowest total interest: {loan_names[min_interest_idx]} (${total_interests[min_interest_idx]:,.2f})")
+    print(f"• Lowest total cost: {loan_names[min_cost_idx]} (${total_costs[min_cost_idx]:,.2f})")
     
     # Show equity build-up over time
+    bal_by_year = [loan.year_end_balance_dict for loan in loans]
     print(f"\nEquity Build-up Analysis (First 5 Years):")
     print("Year | Home Value | Remaining Balance | Equity")
     print("-" * 50)
@@ -256,9 +257,8 @@ def run_interactive_analysis():
         print(f"{year:4d} | ${home_price:>10,.0f} | ", end="")
         for i, loan in enumerate(loans):
             if year <= loan.years:
-                year_ends = loan.get_year_end_balances()
-                if year <= len(year_ends):
-                    balance = year_ends[year_ends['Year'] == year]['Remaining_Balance'].iloc[0]
+                balance = bal_by_year[i].get(year)
+                if balance is not None:
                     equity = home_price - balance
                     if i == 0:
                         print(f"${balance:>15,.0f} | ${equity:>6,.0f}")
@@ -281,9 +281,7 @@ def run_interactive_analysis():
     
     # Save data
     print("\nSaving data...")
-    for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
-        loan.amortization_table.to_csv(f"output/{safe_name}_amortization.csv", index=False)
+    save_amortization_tables(loans, "output")
     
     # Create enhanced comparison CSV
     enhanced_df = comparison_df.copy()
@@ -292,6 +290,7 @@ def run_interactive_analysis():
     enhanced_df['loan_amount'] = loan_amount
     enhanced_df['total_cost'] = down_payment + enhanced_df['total_paid']
     enhanced_df.to_csv("output/enhanced_loan_comparison.csv", index=False)
+    enhanced_df.to_parquet("output/enhanced_loan_comparison.parquet", engine="pyarrow", compression="snappy")
     
     print("\n✅ Interactive analysis complete! Check the 'output' folder for results.")
     print("📊 Files generated:")
@@ -300,8 +299,8 @@ def run_interactive_analysis():
     print("  • principal_interest_breakdown.png - Principal vs interest breakdown")
     print("  • balance_vs_home_value.png - Balance vs home value over time")
     for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
-        print(f"  • {safe_name}_amortization.csv - {loan.loan_name} detailed data")
+        safe_name = safe_filename(loan.loan_name)
+        print(f"  • {safe_name}_amortization.parquet - {loan.loan_name} detailed data")
     print("  • enhanced_loan_comparison.csv - Complete comparison with home price data")
 
 if __name__ == "__main__":
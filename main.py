@@ -1,6 +1,4 @@
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
-from src.visualizations import MortgageVisualizer
-import pandas as pd
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, format_comparison_table, save_amortization_tables
 import os
 
 def main():
@@ -41,19 +39,21 @@ def main():
     print("="*60)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Calculate savings
     monthly_diff = loan_15yr.monthly_payment - loan_30yr.monthly_payment
-    interest_savings = loan_30yr.get_loan_summary()['total_interest'] - loan_15yr.get_loan_summary()['total_interest']
+    interest_30yr = loan_30yr.get_loan_summary()['total_interest']
+    interest_savings = interest_30yr - loan_15yr.get_loan_summary()['total_interest']
     
     print(f"\nKey Insights:")
     print(f"• 15-year loan costs ${monthly_diff:,.2f} more per month")
     print(f"• 15-year loan saves ${interest_savings:,.2f} in total interest")
-    print(f"• Interest savings: {(interest_savings/loan_30yr.get_loan_summary()['total_interest']*100):.1f}%")
+    print(f"• Interest savings: {(interest_savings/interest_30yr*100):.1f}%")
     
     # Create visualizations
     print("\nCreating visualizations...")
+    from src.visualizations import MortgageVisualizer
     visualizer = MortgageVisualizer()
     
     # Create output directory
@@ -68,9 +68,10 @@ def main():
     
     # Save data
     print("\nSaving data...")
-    loan_15yr.amortization_table.to_csv("output/15yr_amortization.csv", index=False)
-    loan_30yr.amortization_table.to_csv("output/30yr_amortization.csv", index=False)
+    save_amortization_tables([loan_15yr, loan_30yr], "output",
+                             file_names=["15yr_amortization.parquet", "30yr_amortization.parquet"])
     comparison_df.to_csv("output/loan_comparison.csv", index=False)
+    comparison_df.to_parquet("output/loan_comparison.parquet", engine="pyarrow", compression="snappy")
     
     print("\n✅ Analysis complete! Check the 'output' folder for results.")
     print("📊 Files generated:")
@@ -79,7 +80,7 @@ def main():
     print("  • loan_comparison.png - Side-by-side loan comparison")
     print("  • balance_comparison.png - Balance comparison over time")
     print("  • interactive_dashboard.html - Interactive dashboard")
-    print("  • CSV files with detailed data")
+    print("  • Parquet and CSV files with detailed data")
 
 if __name__ == "__main__":
     main()
@@ -3,16 +3,13 @@
 Script to run mortgage analysis using data from sample_loans.json
 """
 
-import json
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
-from src.visualizations import MortgageVisualizer
+from src.mortgage_calculator import (MortgageCalculator, MortgageComparison, format_comparison_table, load_json_cached,
+                                     safe_filename, save_amortization_tables)
 import os
 
 def load_sample_loans(json_file="data/sample_loans.json"):
-    """Load loan data from JSON file."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    return data['sample_loans']
+    """Load loan data from JSON file (cached until the file changes)."""
+    return load_json_cached(json_file)['sample_loans']
 
 def get_user_choice():
     """Get user choice between sample data and custom input."""
@@ -59,8 +56,7 @@ def run_analysis_with_sample_data():
     
     # Generate amortization tables
     print("\nGenerating amortization tables...")
-    for loan in loans:
-        loan.generate_amortization_table()
+    comparison.generate_amortization_tables()
     
     # Display comparison
     print("\n" + "="*80)
@@ -68,31 +64,31 @@ def run_analysis_with_sample_data():
     print("="*80)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Show key insights
+    summaries = [loan.get_loan_summary() for loan in loans]
     print(f"\nKey Insights:")
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
+    for loan, summary in zip(loans, summaries):
         print(f"• {loan.loan_name}: ${summary['monthly_payment']:,.2f}/month, ${summary['total_interest']:,.2f} total interest")
     
     # Find best and worst options
-    monthly_payments = [loan.monthly_payment for loan in loans]
-    total_interests = [loan.get_loan_summary()['total_interest'] for loan in loans]
-    
-    min_payment_idx = monthly_payments.index(min(monthly_payments))
-    min_interest_idx = total_interests.index(min(total_interests))
+    loan_names = comparison_df['loan_name'].to_numpy()
+    metrics = comparison_df[['monthly_payment', 'total_interest']].to_numpy()
+    monthly_payments, total_interests = metrics.T
+    min_payment_idx, min_interest_idx = metrics.argmin(axis=0)
     
-    print(f"\n• Lowest monthly payment: {loans[min_payment_idx].loan_name} (${monthly_payments[min_payment_idx]:,.2f})")
-    print(f"• Lowest total interest: {loans[min_interest_idx].loan_name} (${total_interests[min_interest_idx]:,.2f})")
+    print(f"\n• Lowest monthly payment: {loan_names[min_payment_idx]} (${monthly_payments[min_payment_idx]:,.2f})")
+    print(f"• Lowest total interest: {loan_names[min_interest_idx]} (${total_interests[min_interest_idx]:,.2f})")
     
     # Show first few months of each loan
     for loan in loans:
         print(f"\nFirst 3 months of {loan.loan_name}:")
-        print(loan.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head(3).to_string(index=False))
+        print(loan.amortization_table.head(3)[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     # Create visualizations
     print("\nCreating visualizations...")
+    from src.visualizations import MortgageVisualizer
     visualizer = MortgageVisualizer()
     
     # Create output directory
@@ -100,7 +96,7 @@ def run_analysis_with_sample_data():
     
     # Generate plots for each loan
     for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
+        safe_name = safe_filename(loan.loan_name)
         visualizer.plot_amortization_schedule(loan, f"output/{safe_name}_amortization.png")
     
     # Generate comparison plots
@@ -110,18 +106,17 @@ def run_analysis_with_sample_data():
     
     # Save data
     print("\nSaving data...")
-    for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
-        loan.amortization_table.to_csv(f"output/{safe_name}_amortization.csv", index=False)
+    save_amortization_tables(loans, "output")
     
     comparison_df.to_csv("output/sample_loans_comparison.csv", index=False)
+    comparison_df.to_parquet("output/sample_loans_comparison.parquet", engine="pyarrow", compression="snappy")
     
     print("\n✅ Analysis complete! Check the 'output' folder for results.")
     print("📊 Files generated:")
     for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
+        safe_name = safe_filename(loan.loan_name)
         print(f"  • {safe_name}_amortization.png - {loan.loan_name} amortization chart")
-        print(f"  • {safe_name}_amortization.csv - {loan.loan_name} detailed data")
+        print(f"  • {safe_name}_amortization.parquet - {loan.loan_name} detailed data")
     print("  • sample_loans_comparison.png - Side-by-side loan comparison")
     print("  • sample_loans_balance_comparison.png - Balance comparison over time")
     print("  • sample_loans_dashboard.html - Interactive dashboard")
@@ -227,32 +222,32 @@ def run_custom_analysis():
     print("="*80)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Show key insights
+    summaries = [loan.get_loan_summary() for loan in loans]
     print(f"\nKey Insights:")
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
+    for loan, summary in zip(loans, summaries):
         print(f"• {loan.loan_name}: ${summary['monthly_payment']:,.2f}/month, ${summary['total_interest']:,.2f} total interest")
     
     # Find best and worst options
-    monthly_payments = [loan.monthly_payment for loan in loans]
-    total_interests = [loan.get_loan_summary()['total_interest'] for loan in loans]
-    
-    min_payment_idx = monthly_payments.index(min(monthly_payments))
-    min_interest_idx = total_interests.index(min(total_interests))
+    loan_names = comparison_df['loan_name'].to_numpy()
+    metrics = comparison_df[['monthly_payment', 'total_interest']].to_numpy()
+    monthly_payments, total_interests = metrics.T
+    min_payment_idx, min_interest_idx = metrics.argmin(axis=0)
     
-    print(f"\n• Lowest monthly payment: {loans[min_payment_idx].loan_name} (${monthly_payments[min_payment_idx]:,.2f})")
-    print(f"• Lowest total interest: {loans[min_interest_idx].loan_name} (${total_interests[min_interest_idx]:,.2f})")
+    print(f"\n• Lowest monthly payment: {loan_names[min_payment_idx]} (${monthly_payments[min_payment_idx]:,.2f})")
+    print(f"• Lowest total interest: {loan_names[min_interest_idx]} (${total_interests[min_interest_idx]:,.2f})")
     
     # Show first few months of each loan
     print(f"\nFirst 3 months of each loan:")
     for loan in loans:
         print(f"\n{loan.loan_name}:")
-        print(loan.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head(3).to_string(index=False))
+        print(loan.amortization_table.head(3)[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     # Create visualizations
     print("\nCreating visualizations...")
+    from src.visualizations import MortgageVisualizer
     visualizer = MortgageVisualizer()
     
     # Create output directory
@@ -260,7 +255,7 @@ def run_custom_analysis():
     
     # Generate plots for each loan
     for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct").replace("/", "_")
+        safe_name = safe_filename(loan.loan_name)
         visualizer.plot_amortization_schedule(loan, f"output/{safe_name}_amortization.png")
     
     # Generate comparison plots
@@ -270,18 +265,17 @@ def run_custom_analysis():
     
     # Save data
     print("\nSaving data...")
-    for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct").replace("/", "_")
-        loan.amortization_table.to_csv(f"output/{safe_name}_amortization.csv", index=False)
+    save_amortization_tables(loans, "output")
     
     comparison_df.to_csv("output/custom_loan_comparison.csv", index=False)
+    comparison_df.to_parquet("output/custom_loan_comparison.parquet", engine="pyarrow", compression="snappy")
     
     print("\n✅ Analysis complete! Check the 'output' folder for results.")
     print("📊 Files generated:")
     for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct").replace("/", "_")
+        safe_name = safe_filename(loan.loan_name)
         print(f"  • {safe_name}_amortization.png - {loan.loan_name} amortization chart")
-        print(f"  • {safe_name}_amortization.csv - {loan.loan_name} detailed data")
+        print(f"  • {safe_name}_amortization.parquet - {loan.loan_name} detailed data")
     print("  • custom_loan_comparison.png - Side-by-side loan comparison")
     print("  • custom_balance_comparison.png - Balance comparison over time")
     print("  • custom_dashboard.html - Interactive dashboard")
@@ -32,6 +32,9 @@ setup(
     entry_points={
         "console_scripts": [
             "mortgage-calc=mortgage_amortization_calculator.main:main",
+            "mortgage-demo=test_and_demo.demo:demo",
+            "mortgage-simple-demo=test_and_demo.simple_demo:simple_demo",
+            "mortgage-interactive=test_and_demo.interactive_mortgage_input:main",
         ],
     },
 )
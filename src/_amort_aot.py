@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build of the amortization kernel.
+
+Run ``python src/_amort_aot.py`` once (requires Numba and a C compiler) to
+produce the ``amort_aot`` extension module next to this file. The
+calculator imports it when present, so the first amortization doesn't pay
+any JIT compilation cost; without it the JIT or NumPy kernel is used.
+"""
+
+import os
+import sys
+
+from numba.pycc import CC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.mortgage_calculator import _amortize_loop
+
+cc = CC('amort_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('amortize', 'f8[:, :](f8, f8, f8, i8)')(_amortize_loop)
+
+if __name__ == "__main__":
+    cc.compile()
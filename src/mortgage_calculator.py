@@ -1,17 +1,279 @@
+import copy
 import math
+import mmap
+import os
+import re
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Dict, Iterator, List
 import json
+import orjson
+
+try:
+    from numba import njit, prange, vectorize
+except ImportError:  # Numba is optional; the kernel then runs as plain Python
+    njit = None
+    prange = range
+    vectorize = None
+
+# Ahead-of-time compiled kernel, built by src/_amort_aot.py
+try:
+    from . import amort_aot
+except ImportError:
+    try:
+        import amort_aot
+    except ImportError:
+        amort_aot = None
+
+
+def _fill_schedule(principal, monthly_rate, monthly_payment, schedule):
+    """
+    Fill a preallocated (3, n) schedule month by month (Numba kernel).
+    
+    Rows are the principal paid, the interest paid and the remaining
+    balance for each month. Writing into a caller-owned array lets batched
+    callers hand in slices of one shared block without temporaries.
+    """
+    remaining_balance = principal
+    
+    for month in range(schedule.shape[1]):
+        interest_payment = remaining_balance * monthly_rate
+        principal_payment = monthly_payment - interest_payment
+        remaining_balance -= principal_payment
+        
+        # Ensure remaining balance doesn't go negative due to rounding
+        if remaining_balance < 0.01:
+            remaining_balance = 0.0
+        
+        schedule[0, month] = principal_payment
+        schedule[1, month] = interest_payment
+        schedule[2, month] = remaining_balance
+
+
+def _amortize_loop(principal, monthly_rate, monthly_payment, num_payments):
+    """
+    Compute the month-by-month amortization schedule (Numba kernel).
+    
+    Returns:
+        A (3, num_payments) array whose rows are the principal paid, the
+        interest paid and the remaining balance for each month.
+    """
+    schedule = np.empty((3, num_payments), dtype=np.float64)
+    _fill_schedule(principal, monthly_rate, monthly_payment, schedule)
+    return schedule
+
+
+def _amortize_batch(principals, monthly_rates, monthly_payments, num_payments, schedules):
+    """
+    Fill schedules for several loans at once (parallel Numba kernel).
+    
+    schedules is an (L, 3, max_payments) block; loan l is written into
+    schedules[l, :, :num_payments[l]]. Loans are independent, so they are
+    spread across cores with prange.
+    """
+    for loan in prange(principals.shape[0]):
+        _fill_schedule(principals[loan], monthly_rates[loan], monthly_payments[loan],
+                       schedules[loan, :, :num_payments[loan]])
+
+
+def _amortize_closed_form(principal, monthly_rate, monthly_payment, num_payments):
+    """
+    Compute the amortization schedule with vectorized NumPy operations.
+    
+    Returns the same (3, num_payments) layout as _amortize_loop; see
+    _amortize_closed_form_batch for the formula.
+    """
+    return _amortize_closed_form_batch(
+        np.array([principal], dtype=np.float64), np.array([monthly_rate], dtype=np.float64),
+        np.array([monthly_payment], dtype=np.float64), num_payments
+    )[0]
+
+
+def _amortize_closed_form_batch(principals, monthly_rates, monthly_payments, num_payments):
+    """
+    Compute schedules for several loans sharing one term by broadcasting.
+    
+    Uses the closed-form remaining balance after k payments,
+    B_k = P(1+r)^k - M((1+r)^k - 1)/r, evaluated as one (loans, months)
+    block instead of iterating month by month or loan by loan.
+    
+    Returns:
+        A (L, 3, num_payments) array laid out like _amortize_batch's output.
+    """
+    principal = principals[:, None]
+    rate = monthly_rates[:, None]
+    payment = monthly_payments[:, None]
+    months = np.arange(1, num_payments + 1, dtype=np.float64)
+    
+    # (1+r)^k - 1 via expm1/log1p, as in _calculate_monthly_payment; it is
+    # cheaper than a pow per element and keeps near-zero rates accurate
+    growth = np.expm1(months * np.log1p(rate))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        balance = np.where(rate == 0, principal - payment * months,
+                           principal * (growth + 1) - payment * growth / rate)
+    
+    # Ensure remaining balance doesn't go negative due to rounding
+    balance[balance < 0.01] = 0.0
+    
+    schedules = np.empty((len(principals), 3, num_payments), dtype=np.float64)
+    schedules[:, 1, 0] = principals * monthly_rates
+    schedules[:, 1, 1:] = balance[:, :-1] * rate
+    schedules[:, 0] = payment - schedules[:, 1]
+    schedules[:, 2] = balance
+    return schedules
+
+
+def _balance_at(principal, monthly_rate, monthly_payment, month):
+    """
+    Remaining balance after a number of payments (Numba ufunc).
+    
+    The scalar form of the closed-form balance in _amortize_closed_form,
+    compiled into a ufunc so a whole grid of rates x months broadcasts
+    through it in one parallel pass.
+    """
+    if monthly_rate == 0:
+        return principal - monthly_payment * month
+    # (1+r)^k - 1 via expm1/log1p, as in _amortize_closed_form_batch
+    growth = math.expm1(month * math.log1p(monthly_rate))
+    return principal * (growth + 1.0) - monthly_payment * growth / monthly_rate
+
+
+def _jit(signature, func, compiler=None, **options):
+    """Eagerly compile func with Numba, caching the machine code to disk."""
+    compiler = compiler or njit
+    # fastmath lets LLVM fuse the balance recurrence into FMAs; the kernels
+    # never see NaN/inf so the relaxed IEEE semantics are safe.
+    try:
+        return compiler(signature, cache=True, fastmath=True, **options)(func)
+    except ImportError:
+        # The on-disk cache was written while this module was imported under
+        # another name (src.mortgage_calculator vs mortgage_calculator)
+        return compiler(signature, fastmath=True, **options)(func)
+
+
+def _jit_on_first_use(signature, func, compiler=None, **options):
+    """Like _jit, but compile func the first time it is called instead of at import."""
+    kernel = None
+    
+    @wraps(func)
+    def call(*args):
+        nonlocal kernel
+        if kernel is None:
+            kernel = _jit(signature, func, compiler, **options)
+        return kernel(*args)
+    return call
+
+
+if njit is not None:
+    # Compile eagerly with explicit signatures, at import, so the first
+    # amortization request doesn't pay the JIT compilation cost. The AOT
+    # build is there to make import fast, so with it the parallel kernels
+    # are only compiled once generate_amortization_tables() or
+    # balance_curve() needs them.
+    _jit_kernel = _jit if amort_aot is None else _jit_on_first_use
+    # The batch kernel calls _fill_schedule, so it stays a Numba dispatcher;
+    # without a signature Numba compiles it along with the batch kernel
+    fill_signature = 'void(float64, float64, float64, float64[:, :])' if amort_aot is None else None
+    # nogil lets threads (Streamlit sessions, the Parquet writer pools) keep
+    # running while a schedule is being computed
+    _fill_schedule = _jit(fill_signature, _fill_schedule, nogil=True)
+    _amortize_batch = _jit_kernel('void(float64[:], float64[:], float64[:], int64[:], float64[:, :, :])',
+                                  _amortize_batch, parallel=True, nogil=True)
+    _balance_at = _jit_kernel(['float64(float64, float64, float64, int64)'], _balance_at,
+                              compiler=vectorize, target='parallel')
+else:
+    _balance_at = np.vectorize(_balance_at, otypes=[np.float64])
+
+if amort_aot is not None:
+    _amortize = amort_aot.amortize
+elif njit is not None:
+    _amortize = _jit('float64[:, :](float64, float64, float64, int64)', _amortize_loop, nogil=True)
+else:
+    _amortize = _amortize_closed_form
+
+
+@lru_cache(maxsize=1024)
+def _cached_schedule(principal: float, monthly_rate: float, num_payments: int,
+                     monthly_payment: float) -> np.ndarray:
+    """
+    Memoized _amortize for loans that repeat the same terms across scenarios.
+    
+    The returned array is shared between callers, so it is made read-only.
+    """
+    schedule = _amortize(principal, monthly_rate, monthly_payment, num_payments)
+    schedule.flags.writeable = False
+    return schedule
+
+@dataclass(frozen=True)
+class LoanSummary(Mapping):
+    """
+    Summary statistics for one loan, as returned by get_loan_summary().
+    
+    Also a read-only mapping of field name to value, so code written for the
+    dict that get_loan_summary() used to return keeps working.
+    """
+    loan_name: str
+    principal: float
+    annual_rate: float
+    monthly_rate: float
+    years: int
+    monthly_payment: float
+    total_payments: int
+    total_paid: float
+    total_interest: float
+    interest_percentage: float
+    
+    def __getitem__(self, key: str):
+        """Support summary['total_interest'] lookups, as when summaries were dicts."""
+        if key not in _LOAN_SUMMARY_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(_LOAN_SUMMARY_FIELDS)
+    
+    def __len__(self) -> int:
+        return len(_LOAN_SUMMARY_FIELDS)
+
+_LOAN_SUMMARY_FIELDS = tuple(field.name for field in fields(LoanSummary))
+
+def _cached_slot(method):
+    """
+    Like functools.cached_property, for classes with __slots__.
+    
+    The value is computed on first access and kept in the slot named after
+    the method with a leading underscore, which __init__ sets to None.
+    """
+    slot = '_' + method.__name__
+    
+    @wraps(method)
+    def getter(self):
+        value = getattr(self, slot)
+        if value is None:
+            value = method(self)
+            setattr(self, slot, value)
+        return value
+    
+    return property(getter)
 
 class MortgageCalculator:
     """
     A comprehensive mortgage amortization calculator with visualization capabilities.
     """
     
+    # Scenario sweeps create many loans; slots drop the per-instance __dict__
+    __slots__ = ('principal', 'annual_rate', 'years', 'loan_name', 'start_date',
+                 'monthly_rate', 'num_payments', 'monthly_payment', 'amortization_table',
+                 '_loan_summary', '_year_end_balances', '_year_end_balance_dict')
+    
     def __init__(self, principal: float, annual_rate: float, years: int, 
-                 loan_name: str = "Mortgage", start_date: datetime = None):
+                 loan_name: str = "Mortgage", start_date: datetime = None,
+                 monthly_payment: float = None):
         """
         Initialize the mortgage calculator.
         
@@ -21,6 +283,9 @@ class MortgageCalculator:
             years: Loan term in years
             loan_name: Name for this loan (for comparison purposes)
             start_date: Start date of the loan (defaults to today)
+            monthly_payment: Payment already computed for these terms, as
+                MortgageComparison.add_loans does for a batch (computed here
+                when omitted)
         """
         self.principal = principal
         self.annual_rate = annual_rate
@@ -29,96 +294,144 @@ class MortgageCalculator:
         self.start_date = start_date or datetime.now()
         self.monthly_rate = annual_rate / 12
         self.num_payments = years * 12
-        self.monthly_payment = self._calculate_monthly_payment()
+        if monthly_payment is None:
+            monthly_payment = self._calculate_monthly_payment()
+        self.monthly_payment = monthly_payment
         self.amortization_table = None
+        self._loan_summary = None
+        self._year_end_balances = None
+        self._year_end_balance_dict = None
         
     def _calculate_monthly_payment(self) -> float:
         """Calculate monthly payment using the standard mortgage formula."""
         if self.monthly_rate == 0:
             return self.principal / self.num_payments
         
-        monthly_payment = (self.principal * 
-                          (self.monthly_rate * (1 + self.monthly_rate)**self.num_payments) / 
-                          ((1 + self.monthly_rate)**self.num_payments - 1))
+        # growth = (1 + r)^n - 1, computed once and without the cancellation
+        # that (1 + r)**n - 1 suffers for rates close to zero
+        growth = math.expm1(self.num_payments * math.log1p(self.monthly_rate))
+        monthly_payment = self.principal * self.monthly_rate * (growth + 1) / growth
         return monthly_payment
     
     def generate_amortization_table(self) -> pd.DataFrame:
-        """Generate complete amortization table."""
-        table_data = []
-        remaining_balance = self.principal
-        total_interest_paid = 0
-        
-        for month in range(1, self.num_payments + 1):
-            payment_date = self.start_date + timedelta(days=30 * month)
-            interest_payment = remaining_balance * self.monthly_rate
-            principal_payment = self.monthly_payment - interest_payment
-            remaining_balance -= principal_payment
-            total_interest_paid += interest_payment
-            
-            # Ensure remaining balance doesn't go negative due to rounding
-            if remaining_balance < 0.01:
-                remaining_balance = 0
-                principal_payment += remaining_balance
-            
-            table_data.append({
-                'Month': month,
-                'Payment_Date': payment_date,
-                'Payment': round(self.monthly_payment, 2),
-                'Principal': round(principal_payment, 2),
-                'Interest': round(interest_payment, 2),
-                'Remaining_Balance': round(remaining_balance, 2),
-                'Total_Interest_Paid': round(total_interest_paid, 2),
-                'Cumulative_Principal': round(self.principal - remaining_balance, 2)
-            })
+        """Generate complete amortization table (built once per loan)."""
+        if self.amortization_table is not None:
+            return self.amortization_table
+        
+        schedule = _cached_schedule(
+            float(self.principal), float(self.monthly_rate),
+            int(self.num_payments), float(self.monthly_payment)
+        )
+        return self._set_amortization_table(schedule)
+    
+    def _set_amortization_table(self, schedule: np.ndarray) -> pd.DataFrame:
+        """Build the amortization table from a (3, num_payments) schedule."""
+        _, interest, balance = schedule
+        # Terms are a few hundred months, so int16 is plenty
+        months = np.arange(1, self.num_payments + 1, dtype=np.int16)
+        
+        # Derive the money columns into one block so they are rounded in a
+        # single in-place pass; rows are principal, interest, balance, total
+        # interest paid and cumulative principal.
+        money = np.empty((5, self.num_payments), dtype=np.float64)
+        money[:3] = schedule
+        np.cumsum(interest, out=money[3])
+        np.subtract(self.principal, balance, out=money[4])
+        np.round(money, 2, out=money)
         
-        self.amortization_table = pd.DataFrame(table_data)
+        self.amortization_table = pd.DataFrame({
+            'Month': months,
+            'Payment_Date': pd.date_range(pd.Timestamp(self.start_date) + pd.Timedelta(days=30),
+                                          periods=self.num_payments, freq='30D'),
+            'Payment': np.full(self.num_payments, round(self.monthly_payment, 2)),
+            'Principal': money[0],
+            'Interest': money[1],
+            'Remaining_Balance': money[2],
+            'Total_Interest_Paid': money[3],
+            'Cumulative_Principal': money[4]
+        }, copy=False)  # every column is a fresh array owned by this table
         return self.amortization_table
     
-    def get_loan_summary(self) -> Dict:
+    def get_loan_summary(self) -> LoanSummary:
         """Get summary statistics for the loan."""
+        return self.loan_summary
+    
+    @_cached_slot
+    def loan_summary(self) -> LoanSummary:
+        """Summary statistics for the loan (computed once per loan)."""
         if self.amortization_table is None:
             self.generate_amortization_table()
         
         total_paid = self.monthly_payment * self.num_payments
         total_interest = total_paid - self.principal
         
-        return {
-            'loan_name': self.loan_name,
-            'principal': self.principal,
-            'annual_rate': self.annual_rate,
-            'monthly_rate': self.monthly_rate,
-            'years': self.years,
-            'monthly_payment': self.monthly_payment,
-            'total_payments': self.num_payments,
-            'total_paid': total_paid,
-            'total_interest': total_interest,
-            'interest_percentage': (total_interest / total_paid) * 100
-        }
+        return LoanSummary(
+            loan_name=self.loan_name,
+            principal=self.principal,
+            annual_rate=self.annual_rate,
+            monthly_rate=self.monthly_rate,
+            years=self.years,
+            monthly_payment=self.monthly_payment,
+            total_payments=self.num_payments,
+            total_paid=total_paid,
+            total_interest=total_interest,
+            interest_percentage=(total_interest / total_paid) * 100
+        )
+    
+    def balance_curve(self, annual_rates, months) -> np.ndarray:
+        """
+        Remaining balance of this loan's principal and term at other rates.
+        
+        Args:
+            annual_rates: 1-D array of annual interest rates (as decimals)
+            months: 1-D array of payment numbers
+            
+        Returns:
+            A (len(annual_rates), len(months)) array of remaining balances.
+        """
+        monthly_rates = np.asarray(annual_rates, dtype=np.float64)[:, None] / 12
+        growth = np.expm1(self.num_payments * np.log1p(monthly_rates))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payments = np.where(monthly_rates == 0, self.principal / self.num_payments,
+                                self.principal * monthly_rates * (growth + 1) / growth)
+        
+        balances = _balance_at(float(self.principal), monthly_rates, payments,
+                               np.asarray(months, dtype=np.int64))
+        # Ensure remaining balance doesn't go negative due to rounding
+        balances[balances < 0.01] = 0.0
+        return balances
     
     def get_year_end_balances(self) -> pd.DataFrame:
         """Get remaining balance at the end of each year."""
+        return self.year_end_balances
+    
+    @_cached_slot
+    def year_end_balances(self) -> pd.DataFrame:
+        """Remaining balance at the end of each year (computed once per loan)."""
         if self.amortization_table is None:
             self.generate_amortization_table()
         
-        year_ends = []
-        for year in range(1, self.years + 1):
-            month_idx = year * 12 - 1
-            if month_idx < len(self.amortization_table):
-                row = self.amortization_table.iloc[month_idx]
-                year_ends.append({
-                    'Year': year,
-                    'Remaining_Balance': row['Remaining_Balance'],
-                    'Total_Interest_Paid': row['Total_Interest_Paid'],
-                    'Cumulative_Principal': row['Cumulative_Principal']
-                })
-        
-        return pd.DataFrame(year_ends)
+        # Every 12th month is a year end; slice the column arrays directly
+        # rather than going through iloc, a column projection and a reindex
+        columns = {column: self.amortization_table[column].to_numpy()[11::12]
+                   for column in ('Remaining_Balance', 'Total_Interest_Paid', 'Cumulative_Principal')}
+        years = np.arange(1, len(columns['Remaining_Balance']) + 1, dtype=np.int16)
+        return pd.DataFrame({'Year': years, **columns})
+    
+    @_cached_slot
+    def year_end_balance_dict(self) -> Dict[int, float]:
+        """Map each year to its year-end remaining balance for O(1) lookups."""
+        year_ends = self.year_end_balances
+        return dict(zip(year_ends['Year'].tolist(), year_ends['Remaining_Balance'].tolist()))
 
 class MortgageComparison:
     """Compare multiple mortgage options."""
     
+    __slots__ = ('loans', '_comparison_df')
+    
     def __init__(self):
         self.loans = []
+        self._comparison_df = None
     
     def add_loan(self, principal: float, annual_rate: float, years: int, 
                  loan_name: str = None, start_date: datetime = None):
@@ -128,26 +441,179 @@ class MortgageComparison:
         
         loan = MortgageCalculator(principal, annual_rate, years, loan_name, start_date)
         self.loans.append(loan)
+        self._comparison_df = None
         return loan
     
-    def compare_loans(self) -> pd.DataFrame:
-        """Compare all loans in the comparison."""
-        comparison_data = []
-        for loan in self.loans:
-            summary = loan.get_loan_summary()
-            comparison_data.append(summary)
+    def add_loans(self, principal: float, annual_rates: List[float], years_list: List[int],
+                  loan_names: List[str] = None, start_date: datetime = None) -> List[MortgageCalculator]:
+        """
+        Add several loans for the same principal, computing their payments together.
         
-        return pd.DataFrame(comparison_data)
+        The payment formula is broadcast over all the rates and terms at once
+        instead of being evaluated separately for each loan.
+        """
+        monthly_rates = np.asarray(annual_rates, dtype=np.float64) / 12
+        num_payments = np.asarray(years_list, dtype=np.int64) * 12
+        growth = np.expm1(num_payments * np.log1p(monthly_rates))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payments = np.where(monthly_rates == 0, principal / num_payments,
+                                principal * monthly_rates * (growth + 1) / growth)
+        
+        if loan_names is None:
+            loan_names = [f"{years}-Year @ {annual_rate*100:.1f}%"
+                          for annual_rate, years in zip(annual_rates, years_list)]
+        start_date = start_date or datetime.now()
+        
+        loans = [
+            MortgageCalculator(principal, annual_rate, years, loan_name, start_date, monthly_payment)
+            for annual_rate, years, loan_name, monthly_payment
+            in zip(annual_rates, years_list, loan_names, payments.tolist())
+        ]
+        self.loans.extend(loans)
+        self._comparison_df = None
+        return loans
+    
+    def generate_amortization_tables(self):
+        """Generate amortization tables for all loans in one batched kernel call."""
+        if not self.loans:
+            return
+        
+        num_payments = np.array([loan.num_payments for loan in self.loans], dtype=np.int64)
+        schedules = np.empty((len(self.loans), 3, num_payments.max()), dtype=np.float64)
+        
+        if njit is not None:
+            _amortize_batch(
+                np.array([loan.principal for loan in self.loans], dtype=np.float64),
+                np.array([loan.monthly_rate for loan in self.loans], dtype=np.float64),
+                np.array([loan.monthly_payment for loan in self.loans], dtype=np.float64),
+                num_payments, schedules
+            )
+        else:
+            # Without Numba, broadcast the closed form over each group of
+            # loans that share a term
+            for n in np.unique(num_payments):
+                group = np.flatnonzero(num_payments == n)
+                schedules[group, :, :n] = _amortize_closed_form_batch(
+                    np.array([self.loans[i].principal for i in group], dtype=np.float64),
+                    np.array([self.loans[i].monthly_rate for i in group], dtype=np.float64),
+                    np.array([self.loans[i].monthly_payment for i in group], dtype=np.float64),
+                    int(n)
+                )
+        
+        for loan, schedule in zip(self.loans, schedules):
+            loan._set_amortization_table(schedule[:, :loan.num_payments])
+    
+    def compare_loans(self) -> pd.DataFrame:
+        """Compare all loans in the comparison (built once until a loan is added)."""
+        if self._comparison_df is None:
+            # Build column by column rather than transposing a list of records
+            summaries = [loan.get_loan_summary() for loan in self.loans]
+            self._comparison_df = pd.DataFrame({
+                field: [getattr(summary, field) for summary in summaries]
+                for field in _LOAN_SUMMARY_FIELDS
+            })
+        return self._comparison_df
     
     def get_combined_amortization(self) -> pd.DataFrame:
         """Get amortization tables for all loans combined."""
-        combined_data = []
-        for loan in self.loans:
-            if loan.amortization_table is None:
-                loan.generate_amortization_table()
-            
-            df = loan.amortization_table.copy()
-            df['Loan_Name'] = loan.loan_name
-            combined_data.append(df)
+        if any(loan.amortization_table is None for loan in self.loans):
+            self.generate_amortization_tables()
+        tables = [loan.amortization_table for loan in self.loans]
+        
+        if not tables:
+            return pd.DataFrame()
         
-        return pd.concat(combined_data, ignore_index=True)
+        # One concatenation per column instead of copying every table and then
+        # concatenating the copies; Loan_Name is stored as category codes.
+        combined = {column: np.concatenate([table[column].to_numpy() for table in tables])
+                    for column in tables[0].columns}
+        names = [loan.loan_name for loan in self.loans]
+        category_codes = {name: code for code, name in enumerate(dict.fromkeys(names))}
+        codes = np.repeat([category_codes[name] for name in names], [len(table) for table in tables])
+        combined['Loan_Name'] = pd.Categorical.from_codes(codes, list(category_codes))
+        
+        return pd.DataFrame(combined, copy=False)
+
+def format_comparison_table(comparison_df: pd.DataFrame) -> str:
+    """
+    Format the key columns of a compare_loans() frame as a printable table.
+    
+    Formats the four columns directly with f-strings, which is much cheaper
+    than DataFrame.to_string() and its per-cell formatter machinery.
+    """
+    names = comparison_df['loan_name'].tolist()
+    width = max([len('loan_name')] + [len(name) for name in names])
+    
+    lines = [f"{'loan_name':<{width}} {'monthly_payment':>15} {'total_interest':>15} {'total_paid':>15}"]
+    lines.extend(
+        f"{name:<{width}} {monthly:>15.2f} {interest:>15.2f} {paid:>15.2f}"
+        for name, monthly, interest, paid in zip(
+            names,
+            comparison_df['monthly_payment'].tolist(),
+            comparison_df['total_interest'].tolist(),
+            comparison_df['total_paid'].tolist(),
+        )
+    )
+    return '\n'.join(lines)
+
+
+# Below this size a plain read() is cheaper than setting up a memory map
+_MMAP_MIN_BYTES = 1 << 20
+
+def load_json(path: str):
+    """
+    Parse a JSON file such as data/sample_loans.json with orjson.
+    
+    Files of a megabyte or more are parsed straight out of a read-only
+    memory map, skipping the full-file bytes copy of read().
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+def load_json_cached(path: str):
+    """
+    Like load_json(), but reuse the parsed data until the file is modified.
+    
+    Every call returns its own deep copy, so a caller that changes the
+    result can't alter what later callers get from the cache.
+    """
+    return copy.deepcopy(_load_json_cached(path, os.path.getmtime(path)))
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime: float):
+    """Parse path; mtime is only part of the cache key."""
+    return load_json(path)
+
+
+_FILENAME_REPLACEMENTS = {' ': '_', '@': 'at', '%': 'pct', '/': '_'}
+_FILENAME_PATTERN = re.compile('[ @%/]')
+
+@lru_cache(maxsize=64)
+def safe_filename(loan_name: str) -> str:
+    """Turn a loan name like '30-Year @ 6.5%' into '30-Year_at_6.5pct' for file names."""
+    return _FILENAME_PATTERN.sub(lambda match: _FILENAME_REPLACEMENTS[match.group()], loan_name)
+
+
+def save_amortization_tables(loans: List[MortgageCalculator], output_dir: str = "output",
+                             file_names: List[str] = None) -> List[str]:
+    """
+    Write each loan's amortization table to output_dir as Parquet.
+    
+    Files are named <loan name>_amortization.parquet, with the loan name
+    passed through safe_filename(), unless file_names gives one per loan.
+    Returns the paths written.
+    """
+    if file_names is None:
+        file_names = [f"{safe_filename(loan.loan_name)}_amortization.parquet" for loan in loans]
+    paths = [os.path.join(output_dir, file_name) for file_name in file_names]
+    
+    def save(loan, path):
+        loan.generate_amortization_table().to_parquet(path, engine="pyarrow", compression="snappy")
+    
+    # Parquet encoding and the file writes release the GIL, so overlap them
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(save, loans, paths))
+    return paths
@@ -0,0 +1,32 @@
+"""
+Matplotlib helpers shared by the driver scripts that save PNG charts.
+
+Only matplotlib is imported here, so the drivers don't pull in the seaborn
+and Plotly stack that src.visualizations needs.
+"""
+
+import os
+
+# Headless backend; must be chosen before pyplot is imported
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import matplotlib.pyplot as plt
+
+# savefig() options for the driver PNGs. Screen resolution: 150 DPI is a
+# quarter of the pixels of 300, and zlib level 1 encodes much faster than
+# the default level 6
+SAVEFIG_KWARGS = {'dpi': 150, 'bbox_inches': 'tight',
+                  'pil_kwargs': {'optimize': False, 'compress_level': 1}}
+
+_figure_cache = None
+
+def shared_figure(width, height):
+    """Return this process's shared figure, cleared and resized to width x height."""
+    global _figure_cache
+    # plt.close('all') after a batch of plots destroys the cached figure too
+    if _figure_cache is None or not plt.fignum_exists(_figure_cache.number):
+        _figure_cache = plt.figure()
+    _figure_cache.clear()
+    _figure_cache.set_size_inches(width, height)
+    plt.figure(_figure_cache.number)
+    return _figure_cache
@@ -7,6 +7,26 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 
+# (column, title, y-axis label) for each panel of plot_loan_comparison
+_LOAN_COMPARISON_PANELS = (
+    ('monthly_payment', 'Monthly Payment Comparison', 'Monthly Payment ($)'),
+    ('total_interest', 'Total Interest Paid Comparison', 'Total Interest ($)'),
+    ('interest_percentage', 'Interest as % of Total Payments', 'Interest Percentage (%)'),
+    ('total_paid', 'Total Amount Paid Comparison', 'Total Paid ($)'),
+)
+
+# Points kept per plotted series; balance and payment curves are smooth, so
+# this is visually indistinguishable from the full 360 months
+_MAX_PLOT_POINTS = 120
+
+def _decimate(x, *ys, n: int = _MAX_PLOT_POINTS):
+    """Evenly subsample x and each y to at most n points, keeping both ends."""
+    x = np.asarray(x)
+    if len(x) <= n:
+        return (x,) + tuple(np.asarray(y) for y in ys)
+    idx = np.linspace(0, len(x) - 1, n, dtype=int)
+    return (x[idx],) + tuple(np.asarray(y)[idx] for y in ys)
+
 class MortgageVisualizer:
     """Create visualizations for mortgage amortization data."""
     
@@ -23,9 +43,13 @@ class MortgageVisualizer:
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
         
         # Principal vs Interest over time
-        months = loan.amortization_table['Month']
-        principal = loan.amortization_table['Principal']
-        interest = loan.amortization_table['Interest']
+        # Hand matplotlib plain float64 arrays rather than Series it would
+        # otherwise convert on every plot call
+        table = loan.amortization_table
+        months = table['Month'].to_numpy()
+        principal = table['Principal'].to_numpy()
+        interest = table['Interest'].to_numpy()
+        balance = table['Remaining_Balance'].to_numpy()
         
         ax1.plot(months, principal, label='Principal', linewidth=2)
         ax1.plot(months, interest, label='Interest', linewidth=2)
@@ -36,7 +60,6 @@ class MortgageVisualizer:
         ax1.grid(True, alpha=0.3)
         
         # Remaining balance over time
-        balance = loan.amortization_table['Remaining_Balance']
         ax2.plot(months, balance, color='red', linewidth=2)
         ax2.set_title(f'{loan.loan_name} - Remaining Balance Over Time')
         ax2.set_xlabel('Month')
@@ -54,31 +77,19 @@ class MortgageVisualizer:
         """Compare multiple loans side by side."""
         comparison_df = comparison.compare_loans()
         
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-        
-        # Monthly payments comparison
-        ax1.bar(comparison_df['loan_name'], comparison_df['monthly_payment'])
-        ax1.set_title('Monthly Payment Comparison')
-        ax1.set_ylabel('Monthly Payment ($)')
-        ax1.tick_params(axis='x', rotation=45)
-        
-        # Total interest comparison
-        ax2.bar(comparison_df['loan_name'], comparison_df['total_interest'])
-        ax2.set_title('Total Interest Paid Comparison')
-        ax2.set_ylabel('Total Interest ($)')
-        ax2.tick_params(axis='x', rotation=45)
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         
-        # Interest percentage comparison
-        ax3.bar(comparison_df['loan_name'], comparison_df['interest_percentage'])
-        ax3.set_title('Interest as % of Total Payments')
-        ax3.set_ylabel('Interest Percentage (%)')
-        ax3.tick_params(axis='x', rotation=45)
+        # Draw the bars at integer positions and label them once, rather than
+        # passing the names to every ax.bar and going through matplotlib's
+        # string-category converter four times
+        names = comparison_df['loan_name'].tolist()
+        positions = np.arange(len(names))
         
-        # Total paid comparison
-        ax4.bar(comparison_df['loan_name'], comparison_df['total_paid'])
-        ax4.set_title('Total Amount Paid Comparison')
-        ax4.set_ylabel('Total Paid ($)')
-        ax4.tick_params(axis='x', rotation=45)
+        for ax, (column, title, ylabel) in zip(axes.ravel(), _LOAN_COMPARISON_PANELS):
+            ax.bar(positions, comparison_df[column].to_numpy())
+            ax.set_xticks(positions, names, rotation=45)
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
         
         plt.tight_layout()
         
@@ -95,8 +106,8 @@ class MortgageVisualizer:
             if loan.amortization_table is None:
                 loan.generate_amortization_table()
             
-            months = loan.amortization_table['Month']
-            balance = loan.amortization_table['Remaining_Balance']
+            months, balance = _decimate(loan.amortization_table['Month'],
+                                        loan.amortization_table['Remaining_Balance'])
             ax.plot(months, balance, label=loan.loan_name, linewidth=2)
         
         ax.set_title('Remaining Balance Comparison Over Time')
@@ -113,6 +124,8 @@ class MortgageVisualizer:
     def create_interactive_dashboard(self, comparison, save_path: Optional[str] = None):
         """Create an interactive Plotly dashboard."""
         combined_df = comparison.get_combined_amortization()
+        # Split the combined frame once and reuse the groups for every plot
+        groups = list(combined_df.groupby('Loan_Name', sort=False, observed=True))
         
         # Create subplots
         fig = make_subplots(
@@ -126,33 +139,34 @@ class MortgageVisualizer:
         )
         
         # Plot 1: Remaining balance over time
-        for loan_name in combined_df['Loan_Name'].unique():
-            loan_data = combined_df[combined_df['Loan_Name'] == loan_name]
+        for loan_name, loan_data in groups:
+            months, balance = _decimate(loan_data['Month'], loan_data['Remaining_Balance'])
             fig.add_trace(
-                go.Scatter(x=loan_data['Month'], y=loan_data['Remaining_Balance'],
+                go.Scatter(x=months, y=balance,
                           mode='lines', name=f'{loan_name} Balance'),
                 row=1, col=1
             )
         
         # Plot 2: Principal vs Interest
-        for loan_name in combined_df['Loan_Name'].unique():
-            loan_data = combined_df[combined_df['Loan_Name'] == loan_name]
+        for loan_name, loan_data in groups:
+            months, principal, interest = _decimate(loan_data['Month'], loan_data['Principal'],
+                                                    loan_data['Interest'])
             fig.add_trace(
-                go.Scatter(x=loan_data['Month'], y=loan_data['Principal'],
+                go.Scatter(x=months, y=principal,
                           mode='lines', name=f'{loan_name} Principal'),
                 row=1, col=2
             )
             fig.add_trace(
-                go.Scatter(x=loan_data['Month'], y=loan_data['Interest'],
+                go.Scatter(x=months, y=interest,
                           mode='lines', name=f'{loan_name} Interest'),
                 row=1, col=2
             )
         
         # Plot 3: Cumulative interest
-        for loan_name in combined_df['Loan_Name'].unique():
-            loan_data = combined_df[combined_df['Loan_Name'] == loan_name]
+        for loan_name, loan_data in groups:
+            months, total_interest = _decimate(loan_data['Month'], loan_data['Total_Interest_Paid'])
             fig.add_trace(
-                go.Scatter(x=loan_data['Month'], y=loan_data['Total_Interest_Paid'],
+                go.Scatter(x=months, y=total_interest,
                           mode='lines', name=f'{loan_name} Cumulative Interest'),
                 row=2, col=1
             )
@@ -160,8 +174,8 @@ class MortgageVisualizer:
         # Plot 4: Monthly payment breakdown (pie chart)
         comparison_df = comparison.compare_loans()
         fig.add_trace(
-            go.Pie(labels=comparison_df['loan_name'], 
-                  values=comparison_df['monthly_payment'],
+            go.Pie(labels=comparison_df['loan_name'].tolist(), 
+                  values=comparison_df['monthly_payment'].to_numpy(),
                   name="Monthly Payments"),
             row=2, col=2
         )
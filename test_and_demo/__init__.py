@@ -0,0 +1 @@
+# Demo scripts for the mortgage calculator
@@ -0,0 +1,14 @@
+"""
+Make the repository root importable for scripts run directly from test_and_demo.
+
+Imported for its side effect; the root is inserted once, ahead of
+site-packages, however many of the scripts import this module.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -3,11 +3,11 @@
 Quick demo script for the Mortgage Amortization Calculator
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, format_comparison_table
 from src.visualizations import MortgageVisualizer
 
 def demo():
@@ -45,7 +45,7 @@ def demo():
     print("="*60)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Calculate savings
     monthly_diff = loan_15yr.monthly_payment - loan_30yr.monthly_payment
@@ -58,10 +58,10 @@ def demo():
     
     # Show first few months of amortization
     print(f"\nFirst 5 months of 15-year loan:")
-    print(loan_15yr.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head().to_string(index=False))
+    print(loan_15yr.amortization_table.head()[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     print(f"\nFirst 5 months of 30-year loan:")
-    print(loan_30yr.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head().to_string(index=False))
+    print(loan_30yr.amortization_table.head()[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     print("\n✅ Demo complete! Run 'python main.py' for full interactive experience.")
 
@@ -3,14 +3,19 @@
 Demo script showing different home buying scenarios
 """
 
-import json
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functools import lru_cache
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import MortgageCalculator, load_json
 
-def run_scenario(home_price, down_payment, scenario_name):
+@lru_cache(maxsize=64)
+def _cached_amort(principal, annual_rate, years):
+    """Get the LoanSummary for a loan, memoized on its terms."""
+    return MortgageCalculator(principal, annual_rate, years).loan_summary
+
+def run_scenario(home_price, down_payment, scenario_name, sample_loans):
     """Run a specific scenario."""
     print(f"\n{'='*60}")
     print(f"SCENARIO: {scenario_name}")
@@ -23,50 +28,36 @@ def run_scenario(home_price, down_payment, scenario_name):
     print(f"Down Payment: ${down_payment:,} ({down_payment_percent:.1f}%)")
     print(f"Loan Amount: ${loan_amount:,}")
     
-    # Load sample loan configurations
-    with open("data/sample_loans.json", 'r') as f:
-        data = json.load(f)
-    sample_loans = data['sample_loans']
-    
-    # Create comparison
-    comparison = MortgageComparison()
-    loans = []
-    
-    for loan_data in sample_loans:
-        loan = comparison.add_loan(
-            principal=loan_amount,
-            annual_rate=loan_data['annual_rate'],
-            years=loan_data['years'],
-            loan_name=loan_data['name']
-        )
-        loan.generate_amortization_table()
-        loans.append(loan)
+    # Summarize each loan option (memoized on the loan terms)
+    names = [loan_data['name'] for loan_data in sample_loans]
+    summaries = [
+        _cached_amort(loan_amount, loan_data['annual_rate'], loan_data['years'])
+        for loan_data in sample_loans
+    ]
     
-    # Show comparison
-    comparison_df = comparison.compare_loans()
     print(f"\nMonthly Payments:")
-    for _, row in comparison_df.iterrows():
-        print(f"  {row['loan_name']}: ${row['monthly_payment']:,.2f}")
+    for name, summary in zip(names, summaries):
+        print(f"  {name}: ${summary.monthly_payment:,.2f}")
     
     print(f"\nTotal Interest:")
-    for _, row in comparison_df.iterrows():
-        print(f"  {row['loan_name']}: ${row['total_interest']:,.2f}")
+    for name, summary in zip(names, summaries):
+        print(f"  {name}: ${summary.total_interest:,.2f}")
     
     print(f"\nTotal Cost (including down payment):")
-    for _, row in comparison_df.iterrows():
-        total_cost = down_payment + row['total_paid']
-        print(f"  {row['loan_name']}: ${total_cost:,.2f}")
+    for name, summary in zip(names, summaries):
+        total_cost = down_payment + summary.total_paid
+        print(f"  {name}: ${total_cost:,.2f}")
     
     # Find best options
-    monthly_payments = [loan.monthly_payment for loan in loans]
-    total_costs = [down_payment + loan.get_loan_summary()['total_paid'] for loan in loans]
+    monthly_payments = [summary.monthly_payment for summary in summaries]
+    total_costs = [down_payment + summary.total_paid for summary in summaries]
     
     min_payment_idx = monthly_payments.index(min(monthly_payments))
     min_cost_idx = total_costs.index(min(total_costs))
     
     print(f"\nBest Options:")
-    print(f"  Lowest monthly payment: {loans[min_payment_idx].loan_name} (${monthly_payments[min_payment_idx]:,.2f})")
-    print(f"  Lowest total cost: {loans[min_cost_idx].loan_name} (${total_costs[min_cost_idx]:,.2f})")
+    print(f"  Lowest monthly payment: {names[min_payment_idx]} (${monthly_payments[min_payment_idx]:,.2f})")
+    print(f"  Lowest total cost: {names[min_cost_idx]} (${total_costs[min_cost_idx]:,.2f})")
 
 def main():
     """Run multiple scenarios."""
@@ -81,8 +72,11 @@ def main():
         (400000, 120000, "High down payment (30% down)"),
     ]
     
+    # Load sample loan configurations once for all scenarios
+    sample_loans = load_json("data/sample_loans.json")['sample_loans']
+    
     for home_price, down_payment, name in scenarios:
-        run_scenario(home_price, down_payment, name)
+        run_scenario(home_price, down_payment, name, sample_loans)
     
     print(f"\n{'='*60}")
     print("SUMMARY INSIGHTS")
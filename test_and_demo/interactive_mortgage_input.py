@@ -3,12 +3,13 @@
 Interactive Mortgage Calculator - Allows users to input their own mortgage rates and terms
 """
 
-import json
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import orjson
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, format_comparison_table, safe_filename
 from src.visualizations import MortgageVisualizer
 
 def get_user_input():
@@ -112,7 +113,7 @@ def run_interactive_analysis():
     print("="*80)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Show key insights
     print(f"\nKey Insights:")
@@ -134,7 +135,7 @@ def run_interactive_analysis():
     print(f"\nFirst 3 months of each loan:")
     for loan in loans:
         print(f"\n{loan.loan_name}:")
-        print(loan.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head(3).to_string(index=False))
+        print(loan.amortization_table.head(3)[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     # Ask if user wants to generate visualizations
     create_viz = input("\nGenerate visualizations and save data? (y/n): ").lower().strip()
@@ -149,7 +150,7 @@ def run_interactive_analysis():
         
         # Generate plots for each loan
         for loan in loans:
-            safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct").replace("/", "_")
+            safe_name = safe_filename(loan.loan_name)
             visualizer.plot_amortization_schedule(loan, f"output/{safe_name}_amortization.png")
             print(f"  ✓ Created: {safe_name}_amortization.png")
         
@@ -161,7 +162,7 @@ def run_interactive_analysis():
         # Save data
         print("\nSaving data...")
         for loan in loans:
-            safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct").replace("/", "_")
+            safe_name = safe_filename(loan.loan_name)
             loan.amortization_table.to_csv(f"output/{safe_name}_amortization.csv", index=False)
             print(f"  ✓ Saved: {safe_name}_amortization.csv")
         
@@ -171,7 +172,7 @@ def run_interactive_analysis():
         print("\n✅ Analysis complete! Check the 'output' folder for results.")
         print("📊 Files generated:")
         for loan in loans:
-            safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct").replace("/", "_")
+            safe_name = safe_filename(loan.loan_name)
             print(f"  • {safe_name}_amortization.png - {loan.loan_name} amortization chart")
             print(f"  • {safe_name}_amortization.csv - {loan.loan_name} detailed data")
         print("  • interactive_loan_comparison.png - Side-by-side loan comparison")
@@ -190,12 +191,13 @@ def save_current_rates_to_json(loans_data, filename="data/current_rates.json"):
     }
     
     os.makedirs("data", exist_ok=True)
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print(f"\n💾 Current rates saved to {filename}")
 
-if __name__ == "__main__":
+def main():
+    """Run the interactive analysis (console entry point)."""
     try:
         run_interactive_analysis()
         
@@ -211,3 +213,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("Please check your inputs and try again.")
+
+if __name__ == "__main__":
+    main()
@@ -3,32 +3,26 @@
 Script to run mortgage analysis using data from sample_loans.json (fixed version)
 """
 
-import json
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import (MortgageCalculator, MortgageComparison, format_comparison_table, load_json_cached,
+                                     safe_filename, save_amortization_tables)
+from src.plotting import SAVEFIG_KWARGS, shared_figure
 import matplotlib.pyplot as plt
-import pandas as pd
 
 def load_sample_loans(json_file="../data/sample_loans.json"):
-    """Load loan data from JSON file."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    return data['sample_loans']
+    """Load loan data from JSON file (cached until the file changes)."""
+    return load_json_cached(json_file)['sample_loans']
 
-def create_simple_visualizations(loans, comparison):
-    """Create simple visualizations using matplotlib."""
-    # Create output directory
-    os.makedirs("output", exist_ok=True)
-    
-    # 1. Monthly Payment Comparison
-    plt.figure(figsize=(10, 6))
-    loan_names = [loan.loan_name for loan in loans]
-    monthly_payments = [loan.monthly_payment for loan in loans]
+def _plot_monthly(comparison_df):
+    """Monthly payment comparison bar chart."""
+    monthly_payments = comparison_df['monthly_payment'].tolist()
     
-    plt.bar(loan_names, monthly_payments, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    shared_figure(10, 6)
+    plt.bar(comparison_df['loan_name'].tolist(), monthly_payments, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
     plt.title('Monthly Payment Comparison', fontsize=16, fontweight='bold')
     plt.xlabel('Loan Type', fontsize=12)
     plt.ylabel('Monthly Payment ($)', fontsize=12)
@@ -39,14 +33,14 @@ def create_simple_visualizations(loans, comparison):
         plt.text(i, v + 20, f'${v:,.0f}', ha='center', va='bottom', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('output/monthly_payment_comparison.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 2. Total Interest Comparison
-    plt.figure(figsize=(10, 6))
-    total_interests = [loan.get_loan_summary()['total_interest'] for loan in loans]
+    plt.savefig('output/monthly_payment_comparison.png', **SAVEFIG_KWARGS)
+
+def _plot_total_interest(comparison_df):
+    """Total interest comparison bar chart."""
+    total_interests = comparison_df['total_interest'].tolist()
     
-    plt.bar(loan_names, total_interests, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    shared_figure(10, 6)
+    plt.bar(comparison_df['loan_name'].tolist(), total_interests, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
     plt.title('Total Interest Comparison', fontsize=16, fontweight='bold')
     plt.xlabel('Loan Type', fontsize=12)
     plt.ylabel('Total Interest ($)', fontsize=12)
@@ -57,18 +51,18 @@ def create_simple_visualizations(loans, comparison):
         plt.text(i, v + 5000, f'${v:,.0f}', ha='center', va='bottom', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('output/total_interest_comparison.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 3. Balance Over Time (first 10 years)
-    plt.figure(figsize=(12, 8))
+    plt.savefig('output/total_interest_comparison.png', **SAVEFIG_KWARGS)
+
+def _plot_balance(loans):
+    """Remaining balance over the first 10 years."""
+    shared_figure(12, 8)
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
     
     for i, loan in enumerate(loans):
-        year_ends = loan.get_year_end_balances()
         # Only show first 10 years for better visualization
-        year_ends_10yr = year_ends[year_ends['Year'] <= 10]
-        plt.plot(year_ends_10yr['Year'], year_ends_10yr['Remaining_Balance'], 
+        year_ends = loan.get_year_end_balances()
+        year_ends_10yr = year_ends.head(10)  # Years run 1, 2, ... so this is Year <= 10
+        plt.plot(year_ends_10yr['Year'].tolist(), year_ends_10yr['Remaining_Balance'].tolist(), 
                 marker='o', linewidth=2, label=loan.loan_name, color=colors[i])
     
     plt.title('Remaining Balance Over Time (First 10 Years)', fontsize=16, fontweight='bold')
@@ -77,20 +71,20 @@ def create_simple_visualizations(loans, comparison):
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('output/balance_over_time.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 4. Amortization Schedule (Principal vs Interest)
-    fig, axes = plt.subplots(1, len(loans), figsize=(15, 5))
+    plt.savefig('output/balance_over_time.png', **SAVEFIG_KWARGS)
+
+def _plot_schedules(loans):
+    """Principal vs interest over the first 5 years of each loan."""
+    axes = shared_figure(15, 5).subplots(1, len(loans))
     if len(loans) == 1:
         axes = [axes]
     
     for i, loan in enumerate(loans):
         # Get first 5 years of data
         amort_data = loan.amortization_table[loan.amortization_table['Month'] <= 60]
-        
-        axes[i].plot(amort_data['Month'], amort_data['Principal'], label='Principal', linewidth=2)
-        axes[i].plot(amort_data['Month'], amort_data['Interest'], label='Interest', linewidth=2)
+        months = amort_data['Month'].tolist()
+        axes[i].plot(months, amort_data['Principal'].tolist(), label='Principal', linewidth=2)
+        axes[i].plot(months, amort_data['Interest'].tolist(), label='Interest', linewidth=2)
         axes[i].set_title(f'{loan.loan_name}\n(First 5 Years)', fontweight='bold')
         axes[i].set_xlabel('Month')
         axes[i].set_ylabel('Amount ($)')
@@ -98,8 +92,19 @@ def create_simple_visualizations(loans, comparison):
         axes[i].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('output/amortization_schedules.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    plt.savefig('output/amortization_schedules.png', **SAVEFIG_KWARGS)
+
+def create_simple_visualizations(loans, comparison):
+    """Create simple visualizations using matplotlib."""
+    # Create output directory
+    os.makedirs("output", exist_ok=True)
+    
+    comparison_df = comparison.compare_loans()
+    _plot_monthly(comparison_df)
+    _plot_total_interest(comparison_df)
+    _plot_balance(loans)
+    _plot_schedules(loans)
+    plt.close('all')
 
 def run_analysis_with_sample_data():
     """Run mortgage analysis using sample loan data."""
@@ -127,8 +132,7 @@ def run_analysis_with_sample_data():
     
     # Generate amortization tables
     print("\nGenerating amortization tables...")
-    for loan in loans:
-        loan.generate_amortization_table()
+    comparison.generate_amortization_tables()
     
     # Display comparison
     print("\n" + "="*80)
@@ -136,28 +140,27 @@ def run_analysis_with_sample_data():
     print("="*80)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Show key insights
+    summaries = [loan.get_loan_summary() for loan in loans]
     print(f"\nKey Insights:")
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
+    for loan, summary in zip(loans, summaries):
         print(f"• {loan.loan_name}: ${summary['monthly_payment']:,.2f}/month, ${summary['total_interest']:,.2f} total interest")
     
     # Find best and worst options
-    monthly_payments = [loan.monthly_payment for loan in loans]
-    total_interests = [loan.get_loan_summary()['total_interest'] for loan in loans]
-    
-    min_payment_idx = monthly_payments.index(min(monthly_payments))
-    min_interest_idx = total_interests.index(min(total_interests))
+    loan_names = comparison_df['loan_name'].to_numpy()
+    metrics = comparison_df[['monthly_payment', 'total_interest']].to_numpy()
+    monthly_payments, total_interests = metrics.T
+    min_payment_idx, min_interest_idx = metrics.argmin(axis=0)
     
-    print(f"\n• Lowest monthly payment: {loans[min_payment_idx].loan_name} (${monthly_payments[min_payment_idx]:,.2f})")
-    print(f"• Lowest total interest: {loans[min_interest_idx].loan_name} (${total_interests[min_interest_idx]:,.2f})")
+    print(f"\n• Lowest monthly payment: {loan_names[min_payment_idx]} (${monthly_payments[min_payment_idx]:,.2f})")
+    print(f"• Lowest total interest: {loan_names[min_interest_idx]} (${total_interests[min_interest_idx]:,.2f})")
     
     # Show first few months of each loan
     for loan in loans:
         print(f"\nFirst 3 months of {loan.loan_name}:")
-        print(loan.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head(3).to_string(index=False))
+        print(loan.amortization_table.head(3)[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     # Create visualizations
     print("\nCreating visualizations...")
@@ -165,11 +168,10 @@ def run_analysis_with_sample_data():
     
     # Save data
     print("\nSaving data...")
-    for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
-        loan.amortization_table.to_csv(f"output/{safe_name}_amortization.csv", index=False)
+    save_amortization_tables(loans, "output")
     
     comparison_df.to_csv("output/sample_loans_comparison.csv", index=False)
+    comparison_df.to_parquet("output/sample_loans_comparison.parquet", engine="pyarrow", compression="snappy")
     
     print("\n✅ Analysis complete! Check the 'output' folder for results.")
     print("📊 Files generated:")
@@ -178,8 +180,8 @@ def run_analysis_with_sample_data():
     print("  • balance_over_time.png - Line chart showing balance over time")
     print("  • amortization_schedules.png - Principal vs Interest over time")
     for loan in loans:
-        safe_name = loan.loan_name.replace(" ", "_").replace("@", "at").replace("%", "pct")
-        print(f"  • {safe_name}_amortization.csv - {loan.loan_name} detailed data")
+        safe_name = safe_filename(loan.loan_name)
+        print(f"  • {safe_name}_amortization.parquet - {loan.loan_name} detailed data")
     print("  • sample_loans_comparison.csv - Summary comparison data")
 
 if __name__ == "__main__":
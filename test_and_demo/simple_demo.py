@@ -3,11 +3,11 @@
 Simple demo script for the Mortgage Amortization Calculator (no visualization dependencies)
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, format_comparison_table
 
 def simple_demo():
     """Run a simple demonstration of the mortgage calculator."""
@@ -44,7 +44,7 @@ def simple_demo():
     print("="*60)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Calculate savings
     monthly_diff = loan_15yr.monthly_payment - loan_30yr.monthly_payment
@@ -57,25 +57,25 @@ def simple_demo():
     
     # Show first few months of amortization
     print(f"\nFirst 5 months of 15-year loan:")
-    print(loan_15yr.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head().to_string(index=False))
+    print(loan_15yr.amortization_table.head()[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     print(f"\nFirst 5 months of 30-year loan:")
-    print(loan_30yr.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head().to_string(index=False))
+    print(loan_30yr.amortization_table.head()[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     # Show year-end balances
     print(f"\nYear-end balances comparison:")
-    year_ends_15yr = loan_15yr.get_year_end_balances()
-    year_ends_30yr = loan_30yr.get_year_end_balances()
+    balances_15yr = loan_15yr.get_year_end_balances()['Remaining_Balance'].to_numpy()
+    balances_30yr = loan_30yr.get_year_end_balances()['Remaining_Balance'].to_numpy()
     
     for year in [1, 5, 10, 15, 20, 25, 30]:
         if year <= 15:
-            balance_15yr = year_ends_15yr[year_ends_15yr['Year'] == year]['Remaining_Balance'].iloc[0] if year <= len(year_ends_15yr) else 0
+            balance_15yr = balances_15yr[year - 1] if year <= len(balances_15yr) else 0
             print(f"Year {year:2d}: 15-year: ${balance_15yr:>10,.2f}", end="")
         else:
             print(f"Year {year:2d}: 15-year: ${'Paid Off':>10}", end="")
         
         if year <= 30:
-            balance_30yr = year_ends_30yr[year_ends_30yr['Year'] == year]['Remaining_Balance'].iloc[0] if year <= len(year_ends_30yr) else 0
+            balance_30yr = balances_30yr[year - 1] if year <= len(balances_30yr) else 0
             print(f" | 30-year: ${balance_30yr:>10,.2f}")
         else:
             print(f" | 30-year: ${'Paid Off':>10}")
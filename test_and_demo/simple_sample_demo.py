@@ -3,18 +3,15 @@
 Simple demo script using sample_loans.json data (no visualization dependencies)
 """
 
-import json
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, format_comparison_table, load_json
 
 def load_sample_loans(json_file="../data/sample_loans.json"):
     """Load loan data from JSON file."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    return data
+    return load_json(json_file)
 
 def simple_sample_demo():
     """Run a simple demonstration using sample loan data."""
@@ -36,22 +33,19 @@ def simple_sample_demo():
     # Create comparison
     comparison = MortgageComparison()
     
-    # Add each loan from the sample data
-    loans = []
+    # Add all the loans from the sample data in one batch
+    loans = comparison.add_loans(
+        principal=loan_amount,
+        annual_rates=[loan_data['annual_rate'] for loan_data in sample_loans],
+        years_list=[loan_data['years'] for loan_data in sample_loans],
+        loan_names=[loan_data['name'] for loan_data in sample_loans]
+    )
     for loan_data in sample_loans:
-        loan = comparison.add_loan(
-            principal=loan_amount,
-            annual_rate=loan_data['annual_rate'],
-            years=loan_data['years'],
-            loan_name=loan_data['name']
-        )
-        loans.append(loan)
         print(f"Added: {loan_data['name']} - ${loan_amount:,} @ {loan_data['annual_rate']*100:.1f}% for {loan_data['years']} years")
     
     # Generate amortization tables
     print("\nGenerating amortization tables...")
-    for loan in loans:
-        loan.generate_amortization_table()
+    comparison.generate_amortization_tables()
     
     # Display comparison
     print("\n" + "="*80)
@@ -59,45 +53,45 @@ def simple_sample_demo():
     print("="*80)
     
     comparison_df = comparison.compare_loans()
-    print(comparison_df[['loan_name', 'monthly_payment', 'total_interest', 'total_paid']].to_string(index=False))
+    print(format_comparison_table(comparison_df))
     
     # Show key insights
     print(f"\nKey Insights:")
-    for i, loan in enumerate(loans):
-        summary = loan.get_loan_summary()
+    summaries = [loan.get_loan_summary() for loan in loans]
+    for loan, summary in zip(loans, summaries):
         print(f"• {loan.loan_name}: ${summary['monthly_payment']:,.2f}/month, ${summary['total_interest']:,.2f} total interest")
     
     # Find best and worst options
-    monthly_payments = [loan.monthly_payment for loan in loans]
-    total_interests = [loan.get_loan_summary()['total_interest'] for loan in loans]
-    
-    min_payment_idx = monthly_payments.index(min(monthly_payments))
-    min_interest_idx = total_interests.index(min(total_interests))
+    best_payment = min(summaries, key=lambda summary: summary.monthly_payment)
+    best_interest = min(summaries, key=lambda summary: summary.total_interest)
     
-    print(f"\n• Lowest monthly payment: {loans[min_payment_idx].loan_name} (${monthly_payments[min_payment_idx]:,.2f})")
-    print(f"• Lowest total interest: {loans[min_interest_idx].loan_name} (${total_interests[min_interest_idx]:,.2f})")
+    print(f"\n• Lowest monthly payment: {best_payment.loan_name} (${best_payment.monthly_payment:,.2f})")
+    print(f"• Lowest total interest: {best_interest.loan_name} (${best_interest.total_interest:,.2f})")
     
     # Show first few months of each loan
     for loan in loans:
         print(f"\nFirst 3 months of {loan.loan_name}:")
-        print(loan.amortization_table[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].head(3).to_string(index=False))
+        print(loan.amortization_table.head(3)[['Month', 'Payment', 'Principal', 'Interest', 'Remaining_Balance']].to_string(index=False))
     
     # Show year-end balances for comparison
     print(f"\nYear-end balances comparison:")
     year_ends = {}
     for loan in loans:
-        year_ends[loan.loan_name] = loan.get_year_end_balances()
+        year_ends[loan.loan_name] = loan.year_end_balance_dict
     
     max_years = max([loan.years for loan in loans])
+    lines = []
     for year in range(1, min(max_years + 1, 11)):  # Show first 10 years
-        print(f"Year {year:2d}:", end="")
+        parts = []
         for loan in loans:
             if year <= loan.years:
-                balance = year_ends[loan.loan_name][year_ends[loan.loan_name]['Year'] == year]['Remaining_Balance'].iloc[0] if year <= len(year_ends[loan.loan_name]) else 0
-                print(f" {loan.loan_name}: ${balance:>10,.2f}", end="")
+                balance = year_ends[loan.loan_name].get(year, 0)
+                parts.append(f"{loan.loan_name}: ${balance:>10,.2f}")
             else:
-                print(f" {loan.loan_name}: ${'Paid Off':>10}", end="")
-        print()
+                parts.append(f"{loan.loan_name}: ${'Paid Off':>10}")
+        lines.append(f"Year {year:2d}: " + " ".join(parts))
+    # One write for the whole block rather than one per loan
+    print("\n".join(lines))
     
     print("\n✅ Sample data demo complete!")
     print("📝 To install full dependencies and run with visualizations:")
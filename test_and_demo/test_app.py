@@ -3,12 +3,11 @@
 Test script to verify the Streamlit app works correctly
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Run as a plain script rather than via python -m or an entry point
+    import _pathsetup  # noqa: F401
 
-from src.mortgage_calculator import MortgageCalculator, MortgageComparison
-import json
+from src.mortgage_calculator import MortgageCalculator, MortgageComparison, load_json
 
 def test_mortgage_calculations():
     """Test the mortgage calculation functions."""
@@ -34,8 +33,7 @@ def test_mortgage_calculations():
     
     # Test JSON loading
     try:
-        with open("data/sample_loans.json", 'r') as f:
-            data = json.load(f)
+        data = load_json("data/sample_loans.json")
         print(f"✅ JSON loading works: {len(data['sample_loans'])} loan options")
     except Exception as e:
         print(f"❌ JSON loading failed: {e}")
@@ -1,59 +1,285 @@
-import unittest
+import dataclasses
+import json
 import sys
 import os
+import numpy as np
+import pandas as pd
+import pytest
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from mortgage_calculator import MortgageCalculator, MortgageComparison
-
-class TestMortgageCalculator(unittest.TestCase):
-    
-    def setUp(self):
-        self.loan = MortgageCalculator(500000, 0.05, 30, "Test Loan")
-    
-    def test_monthly_payment_calculation(self):
-        """Test monthly payment calculation."""
-        expected_payment = 2684.11  # Approximate
-        actual_payment = self.loan.monthly_payment
-        self.assertAlmostEqual(actual_payment, expected_payment, places=1)
-    
-    def test_amortization_table_generation(self):
-        """Test amortization table generation."""
-        table = self.loan.generate_amortization_table()
-        
-        # Check table has correct number of rows
-        self.assertEqual(len(table), 360)  # 30 years * 12 months
-        
-        # Check first payment
-        first_payment = table.iloc[0]
-        self.assertAlmostEqual(first_payment['Payment'], self.loan.monthly_payment, places=2)
-        
-        # Check last payment (should have zero balance)
-        last_payment = table.iloc[-1]
-        self.assertAlmostEqual(last_payment['Remaining_Balance'], 0, places=2)
-    
-    def test_loan_summary(self):
-        """Test loan summary calculation."""
-        summary = self.loan.get_loan_summary()
-        
-        self.assertEqual(summary['principal'], 500000)
-        self.assertEqual(summary['annual_rate'], 0.05)
-        self.assertEqual(summary['years'], 30)
-        self.assertGreater(summary['total_interest'], 0)
-
-class TestMortgageComparison(unittest.TestCase):
-    
-    def setUp(self):
-        self.comparison = MortgageComparison()
-        self.comparison.add_loan(500000, 0.05, 15, "15-Year")
-        self.comparison.add_loan(500000, 0.065, 30, "30-Year")
-    
-    def test_loan_comparison(self):
-        """Test loan comparison functionality."""
-        comparison_df = self.comparison.compare_loans()
-        
-        self.assertEqual(len(comparison_df), 2)
-        self.assertIn('15-Year', comparison_df['loan_name'].values)
-        self.assertIn('30-Year', comparison_df['loan_name'].values)
-
-if __name__ == '__main__':
-    unittest.main()
+import mortgage_calculator
+from mortgage_calculator import (MortgageCalculator, MortgageComparison, format_comparison_table, load_json, load_json_cached, safe_filename,
+                                 save_amortization_tables,
+                                 _amortize, _amortize_closed_form, _amortize_closed_form_batch, _amortize_loop,
+                                 _cached_schedule)
+
+
+@pytest.fixture(scope="module")
+def loan():
+    # Loans are immutable once built, so the tests can share one
+    loan = MortgageCalculator(500000, 0.05, 30, "Test Loan")
+    loan.generate_amortization_table()
+    return loan
+
+
+@pytest.fixture(scope="module")
+def comparison():
+    comparison = MortgageComparison()
+    comparison.add_loan(500000, 0.05, 15, "15-Year")
+    comparison.add_loan(500000, 0.065, 30, "30-Year")
+    comparison.generate_amortization_tables()
+    return comparison
+
+
+# Mortgage calculator
+
+@pytest.mark.parametrize("annual_rate,years,expected_payment", [
+    (0.05, 30, 2684.11),
+    (0.065, 30, 3160.34),
+    (0.05, 15, 3953.97),
+    (0.0, 10, 4166.67),
+])
+def test_monthly_payment_calculation(annual_rate, years, expected_payment):
+    """Test monthly payment calculation."""
+    loan = MortgageCalculator(500000, annual_rate, years)
+    assert loan.monthly_payment == pytest.approx(expected_payment, abs=0.05)
+
+def test_monthly_payment_near_zero_rate():
+    """Test the payment formula stays accurate for rates close to zero."""
+    loan = MortgageCalculator(100000, 12e-12, 30)
+    assert loan.monthly_payment == pytest.approx(100000 / 360, abs=5e-7)
+
+def test_amortization_table_generation(loan):
+    """Test amortization table generation."""
+    table = loan.generate_amortization_table()
+
+    # Check table has correct number of rows
+    assert len(table) == 360  # 30 years * 12 months
+
+    # Check first payment
+    first_payment = table.iloc[0]
+    assert first_payment['Payment'] == pytest.approx(loan.monthly_payment, abs=0.005)
+
+    # Check last payment (should have zero balance)
+    last_payment = table.iloc[-1]
+    assert last_payment['Remaining_Balance'] == pytest.approx(0, abs=0.005)
+
+def test_loan_summary(loan):
+    """Test loan summary calculation."""
+    summary = loan.get_loan_summary()
+
+    assert summary['principal'] == 500000
+    assert summary['annual_rate'] == 0.05
+    assert summary['years'] == 30
+    assert summary['total_interest'] > 0
+
+def test_loan_summary_is_frozen_record(loan):
+    """Test the summary behaves as a read-only mapping as well as a frozen record."""
+    summary = loan.get_loan_summary()
+
+    assert summary.monthly_payment == summary['monthly_payment']
+    assert dict(summary)['years'] == 30
+    assert 'total_paid' in summary
+    assert 0 not in summary
+    assert list(summary) == [field.name for field in dataclasses.fields(summary)]
+    assert len(summary) == len(list(summary))
+    assert summary.get('missing') is None
+    assert dict(summary.items())['total_paid'] == summary.total_paid
+    assert json.loads(json.dumps(dict(summary)))['years'] == 30
+    with pytest.raises(KeyError):
+        summary['missing']
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        summary.principal = 0
+
+def test_year_end_balances(loan):
+    """Test year-end balances hold the last month of every year."""
+    year_ends = loan.get_year_end_balances()
+    table = loan.amortization_table
+
+    assert year_ends['Year'].tolist() == list(range(1, 31))
+    assert year_ends['Remaining_Balance'].iloc[0] == table['Remaining_Balance'].iloc[11]
+    assert year_ends['Remaining_Balance'].iloc[-1] == 0
+
+def test_balance_curve(loan):
+    """Test the rate sweep reproduces the table balances at the loan's own rate."""
+    curve = loan.balance_curve([0.0, 0.05, 0.07], np.arange(1, 361))
+
+    assert curve.shape == (3, 360)
+    np.testing.assert_allclose(curve[1], loan.generate_amortization_table()['Remaining_Balance'], atol=0.01)
+    np.testing.assert_allclose(curve[0, :12], 500000 - 500000 / 360 * np.arange(1, 13))
+
+def test_balance_curve_near_zero_rate():
+    """Test the rate sweep stays within rounding of the table for rates close to zero."""
+    loan = MortgageCalculator(500000, 12 * 1.2e-10, 30)
+    curve = loan.balance_curve([loan.annual_rate], np.arange(1, 361))
+
+    np.testing.assert_allclose(curve[0], loan.generate_amortization_table()['Remaining_Balance'], atol=0.006)
+
+def test_repeated_terms_share_schedule(loan):
+    """Test loans with the same terms reuse one cached, read-only schedule."""
+    other = MortgageCalculator(500000, 0.05, 30, "Same Terms", start_date=loan.start_date)
+
+    assert other.generate_amortization_table().equals(loan.generate_amortization_table())
+    assert loan.generate_amortization_table() is loan.amortization_table
+    assert loan.get_loan_summary() is loan.get_loan_summary()
+    with pytest.raises(ValueError):
+        _cached_schedule(500000.0, loan.monthly_rate, 360, loan.monthly_payment)[0, 0] = 0
+
+@pytest.mark.parametrize("loan_name,expected", [
+    ("30-Year @ 6.5%", "30-Year_at_6.5pct"),
+    ("ARM 5/1", "ARM_5_1"),
+])
+def test_safe_filename(loan_name, expected):
+    """Test loan names are made safe for use in output file names."""
+    assert safe_filename(loan_name) == expected
+
+
+# Mortgage comparison
+
+def test_loan_comparison(comparison):
+    """Test loan comparison functionality."""
+    comparison_df = comparison.compare_loans()
+
+    assert len(comparison_df) == 2
+    assert '15-Year' in comparison_df['loan_name'].values
+    assert '30-Year' in comparison_df['loan_name'].values
+    assert list(comparison_df.columns) == [
+        'loan_name', 'principal', 'annual_rate', 'monthly_rate', 'years', 'monthly_payment',
+        'total_payments', 'total_paid', 'total_interest', 'interest_percentage'
+    ]
+
+def test_comparison_cached_until_loan_added():
+    """Test compare_loans() is reused until another loan is added."""
+    # Adding a loan would change the shared comparison, so use a fresh one
+    comparison = MortgageComparison()
+    comparison.add_loan(500000, 0.05, 15, "15-Year")
+    comparison_df = comparison.compare_loans()
+    assert comparison.compare_loans() is comparison_df
+
+    comparison.add_loan(500000, 0.055, 20, "20-Year")
+    assert len(comparison.compare_loans()) == 2
+
+def test_add_loans_matches_add_loan():
+    """Test batched loan creation gives the same payments as adding loans one by one."""
+    comparison = MortgageComparison()
+    loans = comparison.add_loans(500000, [0.05, 0.065, 0.0], [15, 30, 10])
+
+    assert [loan.loan_name for loan in comparison.loans] == ["15-Year @ 5.0%", "30-Year @ 6.5%", "10-Year @ 0.0%"]
+    for loan in loans:
+        expected = MortgageCalculator(500000, loan.annual_rate, loan.years)
+        assert loan.monthly_payment == pytest.approx(expected.monthly_payment, abs=5e-10)
+
+def test_format_comparison_table(comparison):
+    """Test the printable comparison has a header and one row per loan."""
+    lines = format_comparison_table(comparison.compare_loans()).split('\n')
+
+    assert len(lines) == 3
+    assert lines[0].split() == ['loan_name', 'monthly_payment', 'total_interest', 'total_paid']
+    assert lines[1].split()[0] == '15-Year'
+    assert lines[1].split()[1] == f"{comparison.loans[0].monthly_payment:.2f}"
+
+def test_combined_amortization(comparison):
+    """Test the combined table stacks every loan's table under its name."""
+    combined = comparison.get_combined_amortization()
+
+    assert len(combined) == 180 + 360
+    assert list(combined['Loan_Name'].unique()) == ['15-Year', '30-Year']
+    thirty_year = combined[combined['Loan_Name'] == '30-Year'].drop(columns='Loan_Name').reset_index(drop=True)
+    assert thirty_year.equals(comparison.loans[1].amortization_table)
+
+def test_batched_amortization_tables(comparison):
+    """Test batched table generation matches generating each loan alone."""
+    comparison.generate_amortization_tables()
+
+    for loan in comparison.loans:
+        assert len(loan.amortization_table) == loan.num_payments
+        expected = MortgageCalculator(loan.principal, loan.annual_rate, loan.years,
+                                      start_date=loan.start_date).generate_amortization_table()
+        assert expected.equals(loan.amortization_table)
+
+
+@pytest.mark.parametrize("file_names,expected", [
+    (None, ['15-Year_amortization.parquet', '30-Year_amortization.parquet']),
+    (['15yr.parquet', '30yr.parquet'], ['15yr.parquet', '30yr.parquet']),
+])
+def test_save_amortization_tables(comparison, tmp_path, file_names, expected):
+    """Test each loan's table is written to its own Parquet file and reads back unchanged."""
+    paths = save_amortization_tables(comparison.loans, str(tmp_path), file_names)
+
+    assert [os.path.basename(path) for path in paths] == expected
+    for loan, path in zip(comparison.loans, paths):
+        assert pd.read_parquet(path).equals(loan.amortization_table)
+
+
+# Amortization kernels
+
+@pytest.mark.parametrize("principal,annual_rate,years", [
+    (500000, 0.05, 30),
+    (308000, 0.065, 15),
+    (100000, 0.0, 10),
+    (100000, 12e-12, 30),
+])
+def test_closed_form_matches_loop(principal, annual_rate, years):
+    """Test the vectorized schedule matches the month-by-month schedule."""
+    loan = MortgageCalculator(principal, annual_rate, years)
+    args = (float(principal), loan.monthly_rate, loan.monthly_payment, loan.num_payments)
+    np.testing.assert_allclose(_amortize_closed_form(*args), _amortize_loop(*args), atol=1e-6)
+
+def test_broadcast_batch_matches_loop():
+    """Test the broadcast closed form matches each loan's own schedule, including a 0% loan."""
+    loans = [MortgageCalculator(principal, annual_rate, 30)
+             for principal, annual_rate in [(500000, 0.05), (308000, 0.065), (100000, 0.0)]]
+    schedules = _amortize_closed_form_batch(
+        np.array([loan.principal for loan in loans], dtype=np.float64),
+        np.array([loan.monthly_rate for loan in loans]),
+        np.array([loan.monthly_payment for loan in loans]), 360
+    )
+
+    for loan, schedule in zip(loans, schedules):
+        expected = _amortize_loop(float(loan.principal), loan.monthly_rate, loan.monthly_payment, 360)
+        np.testing.assert_allclose(schedule, expected, atol=1e-6)
+
+@pytest.mark.skipif(mortgage_calculator.njit is None or mortgage_calculator.amort_aot is not None,
+                    reason="JIT kernels are only compiled when Numba is used without the AOT build")
+def test_jit_kernels_compiled_at_import():
+    """Test the kernels are compiled when the module loads, not on the first call."""
+    for kernel in (_amortize, mortgage_calculator._fill_schedule, mortgage_calculator._amortize_batch):
+        assert len(kernel.signatures) == 1
+
+@pytest.mark.skipif(mortgage_calculator.njit is None or mortgage_calculator.amort_aot is None,
+                    reason="Kernels are only compiled on first use alongside the AOT build")
+def test_aot_build_defers_parallel_kernels():
+    """Test importing with the AOT build leaves the parallel kernels to be compiled on first use."""
+    for kernel in (mortgage_calculator._amortize_batch, mortgage_calculator._balance_at):
+        assert not hasattr(kernel, 'signatures')
+
+def test_selected_kernel_matches_closed_form():
+    """Test whichever kernel was selected at import (AOT, JIT or NumPy) gives the same schedule."""
+    loan = MortgageCalculator(308000, 0.065, 30)
+    args = (308000.0, loan.monthly_rate, loan.monthly_payment, loan.num_payments)
+    np.testing.assert_allclose(_amortize(*args), _amortize_closed_form(*args), atol=1e-6)
+
+
+# JSON loading
+
+@pytest.mark.parametrize("count", [3, 50000])
+def test_small_and_memory_mapped_files(tmp_path, count):
+    """Test files on both sides of the memory-map threshold parse the same way."""
+    data = {"sample_loans": [{"name": f"Loan {i}", "annual_rate": 0.05, "years": 30} for i in range(count)]}
+    path = tmp_path / "loans.json"
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    assert load_json(str(path)) == data
+
+def test_cached_load_returns_independent_copies(tmp_path):
+    """Test cached loads can't be corrupted by callers and pick up file changes."""
+    path = tmp_path / "loans.json"
+    path.write_text(json.dumps({"sample_loans": [{"name": "Loan 0"}]}))
+
+    first = load_json_cached(str(path))
+    first["sample_loans"].append({"name": "Added by caller"})
+    assert load_json_cached(str(path)) == {"sample_loans": [{"name": "Loan 0"}]}
+
+    path.write_text(json.dumps({"sample_loans": []}))
+    os.utime(path, (0, 12345))
+    assert load_json_cached(str(path)) == {"sample_loans": []}
@@ -0,0 +1,49 @@
+import os
+import pytest
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+import matplotlib.pyplot as plt
+
+import app
+import interactive_mortgage_calculator
+from test_and_demo import run_sample_data_fixed
+from src.mortgage_calculator import MortgageComparison
+
+
+@pytest.fixture(scope="module")
+def comparison():
+    comparison = MortgageComparison()
+    comparison.add_loan(400000, 0.065, 30, "30-Year Fixed")
+    comparison.add_loan(400000, 0.055, 15, "15-Year Fixed")
+    comparison.generate_amortization_tables()
+    return comparison
+
+
+@pytest.mark.parametrize("render,png", [
+    (lambda comparison: interactive_mortgage_calculator.create_enhanced_visualizations(
+        comparison.loans, comparison, 500000, 100000), 'monthly_payment_comparison.png'),
+    (lambda comparison: run_sample_data_fixed.create_simple_visualizations(
+        comparison.loans, comparison), 'amortization_schedules.png'),
+], ids=['enhanced', 'simple'])
+def test_repeated_render_keeps_figure_size(render, png, comparison, tmp_path, monkeypatch):
+    """Test a second render in the same process draws at the requested size, not matplotlib's default."""
+    monkeypatch.chdir(tmp_path)
+    path = os.path.join('output', png)
+
+    render(comparison)
+    first_shape = plt.imread(path).shape
+    render(comparison)
+
+    assert plt.imread(path).shape == first_shape
+
+
+def test_equity_table_with_repeated_loan_names():
+    """Test loans sharing a name each get their own equity column."""
+    comparison = MortgageComparison()
+    comparison.add_loan(400000, 0.05, 15, "Custom Loan 2")
+    comparison.add_loan(400000, 0.065, 30, "Custom Loan 2")
+
+    equity_df = app.build_equity_table(comparison.loans, 500000)
+
+    assert list(equity_df.columns) == ['Year', 'Home Value', 'Custom Loan 2', 'Custom Loan 2 (2)']
+    assert equity_df['Custom Loan 2'].iloc[0] != equity_df['Custom Loan 2 (2)'].iloc[0]